@@ -7,7 +7,8 @@ import logging
 from typing import TYPE_CHECKING
 
 from ember_mug import EmberMug
-from ember_mug.consts import EMBER_BLE_SIG
+from ember_mug.consts import EMBER_BLE_SIG, DeviceColour, DeviceModel
+from ember_mug.data import ModelInfo
 from ember_mug.utils import get_model_info_from_advertiser_data
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth import (
@@ -22,14 +23,20 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 
-from .const import CONF_DEBUG, CONFIG_VERSION, DOMAIN, SHUTDOWN_TIMEOUT
+from .capabilities import get_platforms
+from .const import CONF_COLOUR, CONF_DEBUG, CONF_MODEL, CONFIG_VERSION, SHUTDOWN_TIMEOUT
+from .const import DOMAIN as DOMAIN
 from .coordinator import MugDataUpdateCoordinator
+from .services import async_setup_services
+from .websocket import async_setup_websocket
 
 if TYPE_CHECKING:
     from home_assistant_bluetooth import BluetoothServiceInfoBleak
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
 
 type EmberMugConfigEntry = ConfigEntry[MugDataUpdateCoordinator]
@@ -45,14 +52,23 @@ PLATFORMS = [
     Platform.TEXT,
 ]
 _LOGGER = logging.getLogger(__name__)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services and websocket commands shared by all devices."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Mug Platform."""
     address: str = entry.data[CONF_ADDRESS].upper()
     service_info = bluetooth.async_last_service_info(hass, address, connectable=True)
+    model_info = _get_saved_model_info(entry)
 
-    if service_info and not service_info.manufacturer_data:
+    if service_info and not service_info.manufacturer_data and model_info is None:
         _LOGGER.debug("Manufacturer data missing from latest advertisement, looking again.")
         try:
             service_info = await bluetooth.async_process_advertisements(
@@ -78,9 +94,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         service_info.device,
         service_info.manufacturer_data,
     )
+    if model_info is None:
+        model_info = get_model_info_from_advertiser_data(service_info.advertisement)
+        if model_info.model and _process_more_advertisements(service_info):
+            # Save it, so next time there is no need to wait for an advertisement with manufacturer data
+            hass.config_entries.async_update_entry(
+                entry,
+                data={**entry.data, CONF_MODEL: model_info.model, CONF_COLOUR: model_info.colour},
+            )
     ember_mug = EmberMug(
         service_info.device,
-        model_info=get_model_info_from_advertiser_data(service_info.advertisement),
+        model_info=model_info,
         debug=entry.options.get(CONF_DEBUG, False),
         use_metric=None,
     )
@@ -90,7 +114,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ember_mug,
         entry.unique_id,
         entry.data.get(CONF_NAME, entry.title),
+        config_entry=entry,
     )
+    # Show the last known state while connecting
+    await mug_coordinator.async_load_storage()
     entry.async_on_unload(
         bluetooth.async_register_callback(
             hass,
@@ -116,13 +143,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.runtime_data = mug_coordinator
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Only set up the platforms that will have entities for this model
+    mug_coordinator.platforms = get_platforms(PLATFORMS, mug_coordinator.mug.data.model_info.model)
+    await hass.config_entries.async_forward_entry_setups(entry, mug_coordinator.platforms)
 
     async def _async_stop(event: Event) -> None:
         """Close the connection before shutting down."""
         try:
             async with asyncio.timeout(SHUTDOWN_TIMEOUT):
-                await mug_coordinator.mug.disconnect()
+                await mug_coordinator.async_disconnect()
         except TimeoutError:
             _LOGGER.debug("Timed out disconnecting from mug during shutdown.")
 
@@ -136,6 +165,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _get_saved_model_info(entry: ConfigEntry) -> ModelInfo | None:
+    """Get the model info saved from a previous advertisement, if any."""
+    if not (model := entry.data.get(CONF_MODEL)):
+        return None
+    try:
+        colour = DeviceColour(colour_value) if (colour_value := entry.data.get(CONF_COLOUR)) else None
+        return ModelInfo(DeviceModel(model), colour)
+    except ValueError:
+        _LOGGER.debug("Ignoring unknown saved model info: %s, %s", model, entry.data.get(CONF_COLOUR))
+        return None
+
+
 def _process_more_advertisements(
     service_info: BluetoothServiceInfoBleak,
 ) -> bool:
@@ -177,11 +218,10 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
 
 async def async_unload_entry(hass: HomeAssistant, entry: EmberMugConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, entry.runtime_data.platforms)
     if unload_ok:
-        mug_coordinator = entry.runtime_data
-        await mug_coordinator.mug.disconnect()
-        if not hass.config_entries.async_entries(DOMAIN):
-            hass.data.pop(DOMAIN)
+        # The connection scheduler in hass.data is shared by all devices, so it is kept
+        await entry.runtime_data.async_shutdown()
+        await entry.runtime_data.async_disconnect()
 
     return unload_ok
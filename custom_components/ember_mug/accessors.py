@@ -0,0 +1,36 @@
+"""Compiled accessors for dotted device attribute paths like `battery.percent`."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@cache
+def compile_accessor(device_attr: str) -> Callable[[Any], Any]:
+    """
+    Compile a dotted attribute path into a function that gets it from an object.
+
+    The path is only split once and the accessor is shared by everything using the same path.
+    If any part of the path is missing or None, the accessor returns None.
+    """
+    first, *rest = device_attr.split(".")
+    if not rest:
+
+        def get_attr(obj: Any) -> Any:
+            return getattr(obj, first, None)
+
+        return get_attr
+
+    def get_nested_attr(obj: Any) -> Any:
+        value = getattr(obj, first, None)
+        for attr in rest:
+            if value is None:
+                return None
+            value = getattr(value, attr, None)
+        return value
+
+    return get_nested_attr
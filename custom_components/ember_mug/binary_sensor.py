@@ -56,22 +56,24 @@ class MugBinarySensor(BaseMugEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return mug attribute as binary state."""
-        return self.coordinator.get_device_attr(self._device_attr)
+        return self._get_device_attr(self.coordinator.data)
 
 
 class MugLowBatteryBinarySensor(MugBinarySensor):
     """Warn about low battery."""
 
+    _extra_device_attrs = frozenset({"liquid_state"})
+
     @property
     def is_on(self) -> bool | None:
         """Return "on" if battery is low."""
-        battery_percent = self.coordinator.get_device_attr(self._device_attr)
+        battery_percent = self._get_device_attr(self.coordinator.data)
         if battery_percent is None:
             return None
         if battery_percent > 25:
             # Even if heating, it is not low yet.
             return False
-        state = self.coordinator.get_device_attr("liquid_state")
+        state = self.coordinator.data.liquid_state
         # If heating or at target temperature the battery will discharge faster.
         if state in (LiquidState.HEATING, LiquidState.TARGET_TEMPERATURE):
             return True
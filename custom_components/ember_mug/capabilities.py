@@ -0,0 +1,37 @@
+"""Work out which platforms have entities for each device model."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING, Final
+
+from ember_mug.consts import DeviceModel
+from ember_mug.data import ModelInfo
+from homeassistant.const import Platform
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Platforms that only have entities if the device has one of these attributes
+PLATFORM_ATTRIBUTES: Final[dict[Platform, frozenset[str]]] = {
+    Platform.LIGHT: frozenset({"led_colour"}),
+    Platform.TEXT: frozenset({"name"}),
+}
+
+
+@cache
+def get_unsupported_platforms(model: DeviceModel | None) -> frozenset[Platform]:
+    """Get the platforms that would not have any entities for the model, computed once per model."""
+    if model in {None, DeviceModel.UNKNOWN_DEVICE}:
+        # Set up everything and let the platforms decide
+        return frozenset()
+    device_attributes = ModelInfo(model).device_attributes
+    return frozenset(
+        platform for platform, attributes in PLATFORM_ATTRIBUTES.items() if not attributes & device_attributes
+    )
+
+
+def get_platforms(platforms: Iterable[Platform], model: DeviceModel | None) -> list[Platform]:
+    """Filter the platforms down to the ones with entities for the model."""
+    unsupported = get_unsupported_platforms(model)
+    return [platform for platform in platforms if platform not in unsupported]
@@ -0,0 +1,112 @@
+"""Debounce writes to the device, keeping only the latest value for each attribute."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .const import WRITE_DEBOUNCE, WRITE_DEBOUNCE_MAX
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+    type Setter = Callable[[Any], Awaitable[None]]
+    type Sender = Callable[[list[tuple[Setter, Any]]], Awaitable[None]]
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandQueue:
+    """
+    Collect writes for a short while and send only the latest value for each attribute.
+
+    Every write waits for the batch it ended up in to be sent, so errors still reach the caller.
+    The whole batch is sent together, so it only needs one connection.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Sender,
+        debounce: float = WRITE_DEBOUNCE,
+        max_delay: float = WRITE_DEBOUNCE_MAX,
+    ) -> None:
+        """Initialize an empty queue that sends batches with `send`."""
+        self.hass = hass
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._send = send
+        self._pending: dict[str, tuple[Setter, Any]] = {}
+        self._batch: asyncio.Future[None] | None = None
+        self._deadline = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self.writes_queued = 0
+        self.writes_sent = 0
+        self.writes_superseded = 0
+
+    def pending_value(self, attr: str) -> Any:
+        """Get the value waiting to be written to the attribute, if any."""
+        if (pending := self._pending.get(attr)) is None:
+            return None
+        return pending[1]
+
+    async def async_write(self, attr: str, setter: Setter, value: Any) -> None:
+        """Queue the value to be written with the setter and wait until its batch was sent."""
+        loop = self.hass.loop
+        if attr in self._pending:
+            self.writes_superseded += 1
+        self._pending[attr] = (setter, value)
+        self.writes_queued += 1
+        if self._batch is None:
+            self._batch = loop.create_future()
+            self._deadline = loop.time() + self.max_delay
+        if self._handle is not None:
+            self._handle.cancel()
+        # Wait for more writes, but not past the deadline of the first one
+        delay = min(self.debounce, max(self._deadline - loop.time(), 0))
+        self._handle = loop.call_later(delay, self._async_start_flush)
+        await asyncio.shield(self._batch)
+
+    def _async_start_flush(self) -> None:
+        """Send the pending writes in the background."""
+        self._handle = None
+        pending, self._pending = self._pending, {}
+        batch, self._batch = self._batch, None
+        if batch is None:
+            return
+        self._flush_task = self.hass.async_create_background_task(
+            self._async_flush(list(pending.values()), batch),
+            "ember_mug write commands",
+        )
+
+    async def _async_flush(self, writes: list[tuple[Setter, Any]], batch: asyncio.Future[None]) -> None:
+        """Send the writes and let everyone waiting on the batch know how it went."""
+        _LOGGER.debug("Sending %s writes", len(writes))
+        try:
+            await self._send(writes)
+        except asyncio.CancelledError:
+            batch.cancel()
+            raise
+        except Exception as e:
+            batch.set_exception(e)
+        else:
+            self.writes_sent += len(writes)
+            batch.set_result(None)
+
+    def cancel(self) -> None:
+        """Drop any pending writes."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._batch is not None:
+            self._batch.cancel()
+            self._batch = None
+        self._pending = {}
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import logging
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
@@ -17,15 +18,32 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import selector
 from homeassistant.util.unit_conversion import TemperatureConverter
 
-from . import _LOGGER
 from .const import (
     CONF_DEBUG,
+    CONF_DISPATCH_WINDOW,
+    CONF_LEVEL_DEADBAND,
+    CONF_LEVEL_PRECISION,
     CONF_PRESETS,
     CONF_PRESETS_UNIT,
+    CONF_PUSH_FIRST,
+    CONF_STATE_MAX_AGE,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_PRECISION,
     CONFIG_VERSION,
+    DEFAULT_DISPATCH_WINDOW,
+    DEFAULT_LEVEL_DEADBAND,
+    DEFAULT_LEVEL_PRECISION,
     DEFAULT_PRESETS,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_PRECISION,
     DOMAIN,
+    MAX_DISPATCH_WINDOW,
+    MAX_LEVEL_DEADBAND,
+    MAX_PRECISION,
+    MAX_STATE_MAX_AGE,
     MAX_TEMP_CELSIUS,
+    MAX_TEMP_DEADBAND,
     MIN_TEMP_CELSIUS,
 )
 
@@ -35,6 +53,9 @@ if TYPE_CHECKING:
     from homeassistant.data_entry_flow import FlowResult
 
 
+_LOGGER = logging.getLogger(__name__)
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config Flow for Ember Mug."""
 
@@ -189,6 +210,34 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_PRESETS,
                         default=presets_default,
                     ): selector.ObjectSelector(),
+                    vol.Optional(
+                        CONF_PUSH_FIRST,
+                        default=self.config_entry.options.get(CONF_PUSH_FIRST, True),
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_DISPATCH_WINDOW,
+                        default=self.config_entry.options.get(CONF_DISPATCH_WINDOW, DEFAULT_DISPATCH_WINDOW),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_DISPATCH_WINDOW)),
+                    vol.Optional(
+                        CONF_TEMP_PRECISION,
+                        default=self.config_entry.options.get(CONF_TEMP_PRECISION, DEFAULT_TEMP_PRECISION),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_PRECISION)),
+                    vol.Optional(
+                        CONF_TEMP_DEADBAND,
+                        default=self.config_entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_TEMP_DEADBAND)),
+                    vol.Optional(
+                        CONF_LEVEL_PRECISION,
+                        default=self.config_entry.options.get(CONF_LEVEL_PRECISION, DEFAULT_LEVEL_PRECISION),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_PRECISION)),
+                    vol.Optional(
+                        CONF_LEVEL_DEADBAND,
+                        default=self.config_entry.options.get(CONF_LEVEL_DEADBAND, DEFAULT_LEVEL_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_LEVEL_DEADBAND)),
+                    vol.Optional(
+                        CONF_STATE_MAX_AGE,
+                        default=self.config_entry.options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_STATE_MAX_AGE)),
                     vol.Optional(CONF_DEBUG, default=self.config_entry.options.get(CONF_DEBUG, False)): cv.boolean,
                 },
             ),
@@ -1,5 +1,6 @@
 """Constants used for mug."""
 
+from datetime import timedelta
 from enum import StrEnum
 from typing import Final
 
@@ -9,6 +10,8 @@ DOMAIN: Final[str] = "ember_mug"
 MANUFACTURER: Final[str] = "Ember"
 SUGGESTED_AREA: Final[str] = "Kitchen"
 STORAGE_VERSION = 1
+# Collapse changes to stored data within this many seconds into one write
+STORAGE_SAVE_DELAY = 10
 CONFIG_VERSION = 3
 
 ICON_DEFAULT = "mdi:coffee"
@@ -17,8 +20,19 @@ ICON_UNAVAILABLE = "mdi:coffee-off-outline"
 
 ATTR_BATTERY_VOLTAGE = "battery_voltage"
 CONF_DEBUG = "debug"
+# Model info from the advertisement, saved in the entry data
+CONF_MODEL = "model"
+CONF_COLOUR = "colour"
 CONF_PRESETS = "presets"
 CONF_PRESETS_UNIT = "presets_unit"
+CONF_PUSH_FIRST = "push_first"
+CONF_DISPATCH_WINDOW = "dispatch_window"
+# Only write sensor states when the value moved by at least the deadband (after rounding to the precision)
+CONF_TEMP_PRECISION = "temperature_precision"
+CONF_TEMP_DEADBAND = "temperature_deadband"
+CONF_LEVEL_PRECISION = "liquid_level_precision"
+CONF_LEVEL_DEADBAND = "liquid_level_deadband"
+CONF_STATE_MAX_AGE = "state_max_age"
 
 MIN_TEMP_CELSIUS: Final[float] = 48.8
 MAX_TEMP_CELSIUS: Final[float] = 63
@@ -27,6 +41,108 @@ MAX_TEMP_FAHRENHEIT: Final[float] = 150
 
 SHUTDOWN_TIMEOUT: Final[int] = 15
 
+DATA_SCHEDULER: Final[str] = "scheduler"
+DATA_LIVE_CONNECTIONS: Final[str] = "live_connections"
+DATA_LEGACY_STORAGE_LOCK: Final[str] = "legacy_storage_lock"
+# Simultaneous connections each adapter/proxy is trusted with (ESPHome proxies default to 3)
+ADAPTER_CONNECTION_SLOTS: Final[int] = 3
+# How long to wait for a connection slot before giving up
+SLOT_TIMEOUT: Final[int] = 30
+# Wait this many seconds for more writes to the same attribute before sending only the latest
+WRITE_DEBOUNCE: Final[float] = 0.3
+# But never hold back writes for longer than this
+WRITE_DEBOUNCE_MAX: Final[float] = 1.5
+
+# Polling intervals, picked by the coordinator based on the state of the device
+UPDATE_INTERVAL: Final = timedelta(seconds=15)
+UPDATE_INTERVAL_ACTIVE: Final = timedelta(seconds=5)
+UPDATE_INTERVAL_IDLE: Final = timedelta(seconds=60)
+UPDATE_INTERVAL_MAX: Final = timedelta(minutes=5)
+# How long to keep polling quickly after the user changed something
+RECENT_WRITE_WINDOW: Final = timedelta(seconds=60)
+# Notifications are considered live if one was received this recently
+PUSH_HEALTHY_WINDOW: Final = timedelta(minutes=5)
+# While notifications are live, still read the attributes they cover this often in case one was missed
+PUSH_SAFETY_INTERVAL: Final = timedelta(minutes=10)
+
+# Maximum age of each attribute before it is read again, in order of priority
+ATTRIBUTE_MAX_AGE: Final = {
+    "current_temp": UPDATE_INTERVAL_ACTIVE,
+    "liquid_state": UPDATE_INTERVAL_ACTIVE,
+    "liquid_level": timedelta(seconds=30),
+    "battery": timedelta(minutes=1),
+    "target_temp": timedelta(minutes=1),
+    "battery_voltage": timedelta(minutes=5),
+    "led_colour": timedelta(minutes=5),
+    "temperature_unit": timedelta(minutes=10),
+    "volume_level": timedelta(minutes=10),
+    "name": timedelta(hours=1),
+    "date_time_zone": timedelta(hours=1),
+    "firmware": timedelta(hours=1),
+    "meta": timedelta(hours=1),
+    "dsk": timedelta(hours=1),
+    "udsk": timedelta(hours=1),
+}
+# Attributes the device sends notifications about when they change
+NOTIFIED_ATTRS = frozenset(
+    {"battery", "battery_voltage", "current_temp", "liquid_level", "liquid_state", "target_temp"},
+)
+# Merge entity updates arriving within this many seconds into one
+DEFAULT_DISPATCH_WINDOW: Final[float] = 0.5
+MAX_DISPATCH_WINDOW: Final[float] = 5
+# Decimals of the temperature (°C) and liquid level (%) states, and the smallest change written by default
+DEFAULT_TEMP_PRECISION: Final[int] = 1
+DEFAULT_TEMP_DEADBAND: Final[float] = 0.1
+DEFAULT_LEVEL_PRECISION: Final[int] = 0
+DEFAULT_LEVEL_DEADBAND: Final[float] = 1
+MAX_PRECISION: Final[int] = 2
+MAX_TEMP_DEADBAND: Final[float] = 5
+MAX_LEVEL_DEADBAND: Final[float] = 25
+# Write any change of the value once the state is this old in seconds, however small
+DEFAULT_STATE_MAX_AGE: Final[int] = 600
+MAX_STATE_MAX_AGE: Final[int] = 86400
+# Always read, even without entities, as the coordinator picks the poll interval from them
+COORDINATOR_ATTRS: Final = frozenset({"liquid_state", "battery"})
+# Read first on startup, so entities become available as soon as possible
+CRITICAL_ATTRS: Final = ("current_temp", "liquid_state", "battery")
+# How long each stage of the startup may take in seconds
+STARTUP_STAGE_DEADLINES: Final[dict[str, float]] = {
+    # Connecting and reading the critical attributes
+    "critical": 60,
+    # Reading the attributes that are only read on startup
+    "initial": 60,
+    # Reading the rest of the state
+    "state": 60,
+    # Making the device writable
+    "writable": 30,
+}
+# High-rate streaming mode, polling these attributes on every poll at this interval
+STREAM_INTERVAL: Final = timedelta(seconds=2)
+STREAM_ATTRS: Final = frozenset({"current_temp", "liquid_level"})
+STREAM_DEFAULT_DURATION: Final = timedelta(minutes=10)
+STREAM_MAX_DURATION: Final = timedelta(hours=1)
+SERVICE_START_STREAMING: Final = "start_streaming"
+SERVICE_STOP_STREAMING: Final = "stop_streaming"
+ATTR_DURATION: Final = "duration"
+# Fields sent to websocket subscribers of the live data, as dotted device attribute paths
+LIVE_FIELDS: Final = (
+    "available",
+    "current_temp",
+    "target_temp",
+    "liquid_level",
+    "liquid_state",
+    "battery.percent",
+    "battery.on_charging_base",
+)
+# Send at most one message per subscription this often in seconds, merging the changes in between
+LIVE_DEFAULT_INTERVAL: Final[float] = 0.25
+LIVE_MIN_INTERVAL: Final[float] = 0.1
+LIVE_MAX_INTERVAL: Final[float] = 60
+# Live subscriptions allowed per websocket connection, across all devices
+LIVE_MAX_SUBSCRIPTIONS: Final[int] = 10
+# Read attributes this many seconds early, so they aren't skipped because a poll was slightly early
+PLAN_SLACK: Final[float] = 1
+
 DEFAULT_PRESETS = {
     "latte": 55,
     "cappuccino": 56,
@@ -59,6 +175,13 @@ LIQUID_STATE_TEMP_ICONS = {
     LiquidState.WARM_NO_TEMP_CONTROL: "thermometer-high",
 }
 
+# The temperature is changing, so it is worth polling more often
+ACTIVE_LIQUID_STATES = frozenset(
+    {LiquidState.FILLING, LiquidState.COOLING, LiquidState.HEATING},
+)
+# Nothing is happening, so we can poll less often if it is on the charging base
+IDLE_LIQUID_STATES = frozenset({LiquidState.EMPTY, LiquidState.STANDBY})
+
 LIQUID_STATE_MAPPING = {
     LiquidState.EMPTY: LiquidStateValue.EMPTY,
     LiquidState.FILLING: LiquidStateValue.FILLING,
@@ -69,3 +192,7 @@ LIQUID_STATE_MAPPING = {
     LiquidState.TARGET_TEMPERATURE: LiquidStateValue.PERFECT,
     LiquidState.WARM_NO_TEMP_CONTROL: LiquidStateValue.WARM_NO_CONTROL,
 }
+# Number of Bluetooth operations kept per device for diagnostics
+OPERATION_TRACE_SIZE: Final[int] = 100
+# Upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS: Final = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
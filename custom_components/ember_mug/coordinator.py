@@ -2,26 +2,78 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 import traceback
-from datetime import timedelta
-from typing import TYPE_CHECKING, Any, TypedDict
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
 from bleak import BleakError
 from bleak_retry_connector import close_stale_connections
+from ember_mug.consts import INITIAL_ATTRS
 from ember_mug.data import Change, MugData
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN, MANUFACTURER, STORAGE_VERSION, SUGGESTED_AREA
+from .accessors import compile_accessor
+from .commands import CommandQueue
+from .const import (
+    ACTIVE_LIQUID_STATES,
+    CONF_DISPATCH_WINDOW,
+    CONF_PUSH_FIRST,
+    COORDINATOR_ATTRS,
+    CRITICAL_ATTRS,
+    DATA_LEGACY_STORAGE_LOCK,
+    DEFAULT_DISPATCH_WINDOW,
+    DOMAIN,
+    IDLE_LIQUID_STATES,
+    MANUFACTURER,
+    NOTIFIED_ATTRS,
+    PUSH_HEALTHY_WINDOW,
+    PUSH_SAFETY_INTERVAL,
+    RECENT_WRITE_WINDOW,
+    SLOT_TIMEOUT,
+    STARTUP_STAGE_DEADLINES,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    STREAM_ATTRS,
+    STREAM_INTERVAL,
+    SUGGESTED_AREA,
+    UPDATE_INTERVAL,
+    UPDATE_INTERVAL_ACTIVE,
+    UPDATE_INTERVAL_IDLE,
+    UPDATE_INTERVAL_MAX,
+)
+from .live import LiveData
+from .metrics import METRIC_ATTR, MugMetrics
+from .planner import ReadPlanner
+from .scheduler import SlotPriority, SlotTimeoutError, get_scheduler
+from .snapshot import (
+    SNAPSHOT_ATTRS,
+    STATIC_INFO_ATTRS,
+    MugSnapshot,
+    StaticInfo,
+    dump_snapshot,
+    dump_static_info,
+    restore_snapshot,
+    restore_static_info,
+)
+from .streaming import StreamLeases
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+    from datetime import timedelta
+
     from ember_mug import EmberMug
     from home_assistant_bluetooth import BluetoothServiceInfoBleak
     from homeassistant.components.bluetooth import BluetoothChange
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import Platform
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,7 +82,16 @@ _LOGGER = logging.getLogger(__name__)
 class PersistentData(TypedDict):
     """Data that should persist on disk."""
 
-    target_temp_bkp: float | None
+    target_temp_bkp: NotRequired[float | None]
+    snapshot: NotRequired[MugSnapshot]
+    static_info: NotRequired[StaticInfo]
+
+
+class StartupStage(TypedDict):
+    """How a stage of the startup went."""
+
+    duration: float
+    result: str
 
 
 class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
@@ -43,92 +104,502 @@ class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
         mug: EmberMug,
         base_unique_id: str,
         device_name: str,
+        *,
+        config_entry: ConfigEntry | None = None,
     ) -> None:
         """Initialize global Mug data updater."""
         device_type = mug.data.model_info.device_type.value
         super().__init__(
             hass=hass,
             logger=logger,
+            config_entry=config_entry,
             name=f"ember-{device_type.replace('_', '-')}-{base_unique_id}",
-            update_interval=timedelta(seconds=15),
+            update_interval=UPDATE_INTERVAL,
             always_update=False,
         )
-        self._store: Store[PersistentData] = Store(hass, STORAGE_VERSION, DOMAIN)
-        self.persistent_data: PersistentData = None  # type: ignore[assignment]
+        options = config_entry.options if config_entry else {}
+        self._store: Store[PersistentData] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{base_unique_id}")
+        self.persistent_data: PersistentData = {}
+        self._storage_loaded = False
+        # Showing the last known state until the device is read
+        self.restored = False
         self.device_name = device_name
         self.device_type = device_type
         self.base_unique_id = base_unique_id
         self.mug = mug
         self.data = self.mug.data
         self.available = False
-        self._last_refresh_was_full = True
+        self._planner = ReadPlanner()
+        # A copy, as the library removes the extra attributes from its own set when dumping the data
+        self._model_info = mug.data.model_info
+        self._device_attributes = frozenset(self._model_info.device_attributes)
+        self._scheduler = get_scheduler(hass)
+        self.adapter: str | None = None
+        self._attribute_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self.dispatch_window: float = options.get(CONF_DISPATCH_WINDOW, DEFAULT_DISPATCH_WINDOW)
+        self._dispatch_handle: asyncio.TimerHandle | None = None
+        self._pending_attrs: set[str] = set()
+        self._pending_all = False
+        self._polling = False
+        self.dispatches = 0
+        self.dispatches_saved = 0
+        self._last_advertisement: tuple[Any, ...] | None = None
+        self._stale_task: asyncio.Task[None] | None = None
+        self.adverts_processed = 0
+        self.adverts_skipped = 0
+        self.adverts_coalesced = 0
+        self.commands = CommandQueue(hass, self._async_send_writes)
+        self.push_first: bool = options.get(CONF_PUSH_FIRST, True)
+        self.push_live = False
+        self._last_write: float | None = None
+        self._consecutive_failures = 0
+        self._startup_task: asyncio.Task[None] | None = None
+        self.startup_stages: dict[str, StartupStage] = {}
+        self.metrics = MugMetrics()
+        self.streams = StreamLeases(hass, self._async_streaming_changed)
+        self.live = LiveData(hass, self._get_live_value)
+        # The platforms set up for this device
+        self.platforms: list[Platform] = []
         _LOGGER.info("%s %s Setup", self.mug.model_name, self.name)
 
     async def _async_setup(self) -> None:
-        """Initialize coordinator and fetch initial data."""
-        # Setup storage
-        self.persistent_data = await self._store.async_load()
+        """
+        Connect to the device and read the critical attributes, so entities become available as soon as possible.
+
+        The rest is read in stages in the background afterwards.
+        """
+        if not self._storage_loaded:
+            await self.async_load_storage()
         try:
-            await self.mug.pair()
-            await self.mug.update_initial()
-            await self.mug.update_all()
-            if not self.persistent_data:
-                await self.write_to_storage(self.mug.data.target_temp)
-            _LOGGER.debug("[Initial Update] values: %s", self.mug.data)
-        except (TimeoutError, BleakError) as e:
+            async with self._startup_stage("critical"), self._slot(SlotPriority.SETUP):
+                await self.mug.pair()
+                await self._async_update_multiple({attr for attr in CRITICAL_ATTRS if self.mug.has_attribute(attr)})
+        except (TimeoutError, BleakError, SlotTimeoutError) as e:
+            self.metrics.record_failure(e)
             if isinstance(e, BleakError):
                 _LOGGER.debug("An error occurred trying to update the %s: %s", self.mug.model_name, e)
             raise UpdateFailed(
                 f"An error occurred updating {self.mug.model_name}: {e=}",
             ) from e
 
-        try:
-            is_writable = await self.mug.make_writable()
-            _LOGGER.debug("Mug writability: %s", is_writable)
-        except (TimeoutError, BleakError) as e:
-            if isinstance(e, BleakError):
-                _LOGGER.debug("An error occurred trying to make the %s writable: %s", self.mug.model_name, e)
-
         self.mug.register_callback(self._async_handle_callback)
+        self.restored = False
         self.async_update_listeners()
+        self._startup_task = self.hass.async_create_task(
+            self._async_startup_stages(),
+            f"{self.name} startup",
+            eager_start=False,
+        )
+
+    async def _async_startup_stages(self) -> None:
+        """Read everything else from the device in stages, each with its own deadline."""
+        stages: dict[str, Callable[[], Awaitable[None]]] = {
+            "initial": self._async_update_initial,
+            "state": self._async_update_state,
+            "writable": self._async_make_writable,
+        }
+        for stage, func in stages.items():
+            try:
+                async with self._startup_stage(stage), self._slot(SlotPriority.SETUP):
+                    await func()
+            except (TimeoutError, BleakError, SlotTimeoutError) as e:
+                self.metrics.record_failure(e)
+                # Anything not read will be picked up by polling
+                _LOGGER.debug("Startup stage %s of %s failed: %s", stage, self.mug.model_name, e)
+            else:
+                self.async_schedule_dispatch()
+        if "target_temp_bkp" not in self.persistent_data:
+            self.write_to_storage(self.mug.data.target_temp)
+        self._async_schedule_save()
+        _LOGGER.debug("[Initial Update] values: %s, stages: %s", self.mug.data, self.startup_stages)
+
+    @contextlib.asynccontextmanager
+    async def _startup_stage(self, stage: str) -> AsyncIterator[None]:
+        """Give up on a stage of the startup after its deadline and record how long it took."""
+        start = monotonic()
+        result = "error"
+        try:
+            async with asyncio.timeout(STARTUP_STAGE_DEADLINES[stage]):
+                yield
+            result = "done"
+        except TimeoutError:
+            result = "timeout"
+            raise
+        finally:
+            self.startup_stages[stage] = {"duration": round(monotonic() - start, 3), "result": result}
+
+    async def _async_update_state(self) -> None:
+        """Read the attributes that weren't read by the other stages."""
+        remaining = self.demanded_attributes - INITIAL_ATTRS - set(CRITICAL_ATTRS)
+        await self._async_update_multiple(remaining)
+
+    async def _async_update_multiple(self, attrs: set[str]) -> None:
+        """Read several attributes from the device at once."""
+        async with self._operation("read_multiple", ",".join(sorted(attrs))):
+            await self.mug._update_multiple(attrs)  # noqa: SLF001
+        self.metrics.reads += len(attrs)
+        self._planner.mark_read(attrs)
+
+    async def _async_make_writable(self) -> None:
+        """Make sure the device can be written to."""
+        is_writable = await self.mug.make_writable()
+        _LOGGER.debug("Mug writability: %s", is_writable)
+
+    async def _async_update_initial(self) -> None:
+        """
+        Read the attributes that are only read on startup.
+
+        If the static info of the device was saved for the same firmware, only the firmware has to be read.
+        """
+        if static_info := self.persistent_data.get("static_info"):
+            changed: list[Change] = []
+            await self._async_read_attributes(["firmware"], changed)
+            if restore_static_info(self.mug.data, static_info):
+                _LOGGER.debug("Reusing static info of %s: %s", self.base_unique_id, static_info)
+                # They are as good as read, so polls don't read them again
+                self._planner.mark_read(STATIC_INFO_ATTRS)
+                return
+            _LOGGER.debug("The firmware of %s changed, reading all static info", self.base_unique_id)
+        async with self._operation("read_initial"):
+            await self.mug.update_initial()
+        self.metrics.reads += len(INITIAL_ATTRS)
+        self._planner.mark_read(INITIAL_ATTRS)
+        if static_info := dump_static_info(self.mug.data):
+            self.persistent_data["static_info"] = static_info
 
     async def _async_update_data(self) -> MugData:
-        """Poll the device."""
+        """Poll the device for the attributes that are due to be read."""
+        if self._startup_task is not None and not self._startup_task.done():
+            _LOGGER.debug("Skipping update while starting up")
+            return self.mug.data
         _LOGGER.debug("Updating")
-        full_update = not self._last_refresh_was_full
-        changed: list[Change] | None = []
+        was_available = self.available
+        changed: list[Change] = []
+        planned: list[str] = []
+        self._polling = True
         try:
-            if not self._last_refresh_was_full:
-                # Only fully poll all data every other call to limit time
-                changed += await self.mug.update_all()
-            else:
-                changed += await self.mug.update_queued_attributes()
-            self._last_refresh_was_full = not self._last_refresh_was_full
+            # Attributes the device told us changed are read from the queue first
+            queued = set(self.mug._queued_updates)  # noqa: SLF001
+            planned = self._planner.plan(
+                self.demanded_attributes,
+                relaxed=NOTIFIED_ATTRS,
+                relaxed_max_age=PUSH_SAFETY_INTERVAL if self._check_push_live() else None,
+                exclude=queued,
+                always=STREAM_ATTRS if self.streams.active else (),
+            )
+            if planned or queued:
+                await self._async_poll(queued, planned, changed)
             self.available = True
+            self._consecutive_failures = 0
+        except SlotTimeoutError as e:
+            # The adapter is busy with other devices, which doesn't mean this one is unavailable
+            _LOGGER.debug("Skipping update of %s: %s", self.mug.model_name, e)
         except (TimeoutError, BleakError) as e:
+            self.metrics.record_failure(e)
             if isinstance(e, BleakError):
                 _LOGGER.debug("An error occurred trying to update the %s: %s", self.mug.model_name, e)
             if self.available:
                 _LOGGER.debug("%s is not available: %s", self.mug.model_name, e)
                 self.available = False
-            changed = None
+            self._consecutive_failures += 1
         except Exception as e:
             _LOGGER.exception(
                 "An unexpected error occurred whilst updating the %s",
                 self.mug.model_name,
             )
             self.available = False
+            self._consecutive_failures += 1
+            self.update_interval = self._next_update_interval()
             _LOGGER.debug("Stacktrace: %s", traceback.format_exception(e))
             raise UpdateFailed(f"An error occurred updating {self.mug.model_name}: {e}") from e
+        finally:
+            self._polling = False
+            self.metrics.record_notifications(self.mug._latest_events)  # noqa: SLF001
 
+        self.update_interval = self._next_update_interval()
         _LOGGER.debug(
-            "[%s Update] Changed: %s",
-            "Full" if full_update else "Partial",
+            "[Update] Planned: %s, Changed: %s, next update in %s",
+            planned,
             changed,
+            self.update_interval,
         )
-        self.async_update_listeners()
+        if self.available != was_available:
+            # Availability affects all entities
+            self.async_schedule_dispatch()
+        else:
+            self.async_schedule_dispatch(change.attr for change in changed)
+            if METRIC_ATTR in self._attribute_listeners:
+                # Only if any of the metric sensors are enabled
+                self.async_schedule_dispatch((METRIC_ATTR,))
+        if any(change.attr in SNAPSHOT_ATTRS for change in changed):
+            self._async_schedule_save()
+        self.live.async_publish()
         return self.mug.data
 
+    async def _async_poll(self, queued: set[str], planned: list[str], changed: list[Change]) -> None:
+        """Read the queued and planned attributes on one connection, timing how long it took."""
+        start = monotonic()
+        async with self._operation("poll"), self._slot(SlotPriority.POLL):
+            if queued:
+                async with self._operation("read_queued", ",".join(sorted(queued))):
+                    changed += await self.mug.update_queued_attributes()
+            self.metrics.reads += len(queued)
+            self._planner.mark_read(queued)
+            await self._async_read_attributes(planned, changed)
+        self.metrics.record_poll(monotonic() - start)
+
+    @property
+    def planner(self) -> ReadPlanner:
+        """Get the planner of the reads, which counts how many were skipped."""
+        return self._planner
+
+    @property
+    def demanded_attributes(self) -> frozenset[str]:
+        """
+        Get the attributes that need to be read, as an enabled entity depends on them.
+
+        Entities only listen while they are enabled, so this follows them being enabled or disabled.
+        Until any entities were added, everything is read.
+        """
+        if (model_info := self.mug.data.model_info) is not self._model_info:
+            self._model_info = model_info
+            self._device_attributes = frozenset(model_info.device_attributes)
+        if not self._attribute_listeners:
+            return self._device_attributes
+        demanded = self._attribute_listeners.keys() | COORDINATOR_ATTRS
+        if self.streams.active:
+            demanded |= STREAM_ATTRS
+        return self._device_attributes & demanded
+
+    @callback
+    def async_add_attribute_listener(
+        self,
+        attrs: Iterable[str],
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Listen for changes to any of the given device attributes."""
+        attrs = frozenset(attrs)
+        for attr in attrs:
+            self._attribute_listeners.setdefault(attr, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the attribute listener."""
+            for attr in attrs:
+                self._attribute_listeners[attr].remove(update_callback)
+                if not self._attribute_listeners[attr]:
+                    del self._attribute_listeners[attr]
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, including those only listening to some attributes, once each."""
+        # Entities listen both ways, so they are only updated once
+        notified = {update_callback for update_callback, _ in self._listeners.values()}
+        super().async_update_listeners()
+        self.async_update_attribute_listeners(self._attribute_listeners, notified)
+
+    @callback
+    def async_update_attribute_listeners(
+        self,
+        attrs: Iterable[str],
+        notified: set[CALLBACK_TYPE] | None = None,
+    ) -> None:
+        """Update only the listeners of the attributes that changed, once each, skipping any already `notified`."""
+        if notified is None:
+            notified = set()
+        for attr in set(attrs):
+            for update_callback in list(self._attribute_listeners.get(attr, ())):
+                if update_callback not in notified:
+                    notified.add(update_callback)
+                    update_callback()
+
+    @callback
+    def async_schedule_dispatch(self, attrs: Iterable[str] | None = None) -> None:
+        """
+        Update the listeners of the changed attributes (or all listeners if None) after the dispatch window.
+
+        Anything else arriving within the window is merged into the same update.
+        """
+        if attrs is None:
+            self._pending_all = True
+        else:
+            attrs = set(attrs)
+            if not attrs:
+                # Nothing changed, so there is nothing to merge either
+                return
+            self._pending_attrs.update(attrs)
+        if self._dispatch_handle is not None:
+            self.dispatches_saved += 1
+            return
+        if self.dispatch_window <= 0:
+            self._async_dispatch()
+            return
+        self._dispatch_handle = self.hass.loop.call_later(self.dispatch_window, self._async_dispatch)
+
+    @callback
+    def _async_dispatch(self) -> None:
+        """Update the listeners of everything that changed during the dispatch window."""
+        self._dispatch_handle = None
+        self.dispatches += 1
+        attrs, self._pending_attrs = self._pending_attrs, set()
+        if self._pending_all:
+            self._pending_all = False
+            self.async_update_listeners()
+        else:
+            self.async_update_attribute_listeners(attrs)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any pending dispatch and stale connection sweep when shutting down."""
+        await super().async_shutdown()
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+        if self._stale_task is not None:
+            self._stale_task.cancel()
+            self._stale_task = None
+        if self._startup_task is not None:
+            self._startup_task.cancel()
+            self._startup_task = None
+        self.commands.cancel()
+        self.streams.async_cancel()
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, priority: SlotPriority) -> AsyncIterator[None]:
+        """Wait for a connection slot on the adapter currently used to reach the device."""
+        address = self.mug.device.address
+        service_info = bluetooth.async_last_service_info(self.hass, address, connectable=True)
+        adapter = service_info.source if service_info else self.adapter
+        if self.adapter is not None and adapter != self.adapter:
+            # The device moved to another adapter, so it no longer holds a connection on the old one
+            await self._scheduler.async_release(self.adapter, address)
+        self.adapter = adapter
+        async with contextlib.AsyncExitStack() as stack:
+            async with self._operation("slot_wait", priority.name.lower()):
+                await stack.enter_async_context(
+                    self._scheduler.slot(adapter, address, priority, self.mug.disconnect, SLOT_TIMEOUT),
+                )
+            was_connected = self._is_connected()
+            try:
+                yield
+            finally:
+                if not was_connected and self._is_connected():
+                    self.metrics.record_connection()
+
+    @contextlib.asynccontextmanager
+    async def _operation(self, name: str, characteristic: str | None = None) -> AsyncIterator[None]:
+        """Time an operation with the device and add it to the trace, whether it succeeded or not."""
+        start = monotonic()
+        error: BaseException | None = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.metrics.record_operation(name, characteristic, monotonic() - start, error, self.adapter)
+
+    def _is_connected(self) -> bool:
+        """Check whether there is currently a connection to the device."""
+        client = self.mug._client  # noqa: SLF001
+        return client is not None and client.is_connected
+
+    async def async_queue_write[T](self, attr: str, func: Callable[[T], Awaitable[None]], value: T) -> None:
+        """
+        Write a change to the attribute once the user stopped changing it.
+
+        Only the latest value for each attribute is written and all pending writes are sent on one connection.
+        """
+        await self.commands.async_write(attr, func, value)
+
+    async def _async_send_writes(self, writes: list[tuple[Callable[[Any], Awaitable[None]], Any]]) -> None:
+        """Send a batch of writes to the device, with priority over polls for the connection."""
+        try:
+            async with self._slot(SlotPriority.WRITE):
+                for func, value in writes:
+                    async with self._operation("write", getattr(func, "__name__", "").removeprefix("set_") or None):
+                        await func(value)
+                    self.metrics.writes += 1
+        except (TimeoutError, BleakError) as e:
+            self.metrics.record_failure(e)
+            raise
+        finally:
+            # Even if one failed, the ones before it went through
+            self.refresh_from_mug()
+
+    async def async_disconnect(self) -> None:
+        """Disconnect from the device and give up its connection slot."""
+        await self.mug.disconnect()
+        await self._scheduler.async_release(self.adapter, self.mug.device.address)
+
+    async def _async_read_attributes(self, attrs: list[str], changed: list[Change]) -> None:
+        """
+        Read the given attributes from the device one by one, in order.
+
+        Changes are added to `changed` as they are read, so they are kept even if a later read fails.
+        """
+        if not attrs:
+            return
+        # Only time it if there isn't a connection already, otherwise this returns straight away
+        async with contextlib.nullcontext() if self._is_connected() else self._operation("connect"):
+            await self.mug._ensure_connection()  # noqa: SLF001
+        for attr in attrs:
+            async with self._operation("read", attr):
+                value = await getattr(self.mug, f"get_{attr}")()
+            self.metrics.reads += 1
+            changed += self.mug.data.update_info(**{attr: value})
+            self._planner.mark_read((attr,))
+
+    @property
+    def last_push_event(self) -> float | None:
+        """Timestamp of the latest notification received from the device, if any."""
+        return max(self.mug._latest_events.values(), default=None)  # noqa: SLF001
+
+    def _check_push_live(self) -> bool:
+        """Check whether notifications are currently arriving from the device."""
+        last_push = self.last_push_event
+        push_live = (
+            self.push_first and last_push is not None and time() - last_push < PUSH_HEALTHY_WINDOW.total_seconds()
+        )
+        if push_live != self.push_live:
+            _LOGGER.debug(
+                "%s notifications %s",
+                self.mug.model_name,
+                "are live, relying on them" if push_live else "went quiet, polling again",
+            )
+            self.push_live = push_live
+        return push_live
+
+    def _next_update_interval(self) -> timedelta:
+        """
+        Pick the interval until the next poll based on the state of the device.
+
+        Poll quickly while the temperature is changing or the user has just changed something,
+        slowly while it is sitting empty on the charging base and back off if it keeps failing.
+        """
+        if self._consecutive_failures:
+            return min(UPDATE_INTERVAL * 2**self._consecutive_failures, UPDATE_INTERVAL_MAX)
+        if self.streams.active:
+            return STREAM_INTERVAL
+        if self._last_write is not None and monotonic() - self._last_write < RECENT_WRITE_WINDOW.total_seconds():
+            return UPDATE_INTERVAL_ACTIVE
+        data = self.mug.data
+        if data.liquid_state in ACTIVE_LIQUID_STATES:
+            return UPDATE_INTERVAL_ACTIVE
+        if data.liquid_state in IDLE_LIQUID_STATES and data.battery and data.battery.on_charging_base:
+            return UPDATE_INTERVAL_IDLE
+        return UPDATE_INTERVAL
+
+    @callback
+    def _async_streaming_changed(self, streaming: bool) -> None:
+        """Switch between the high-rate streaming mode and the normal poll interval."""
+        _LOGGER.debug("%s streaming %s", self.mug.model_name, "started" if streaming else "stopped")
+        self.update_interval = self._next_update_interval()
+        if streaming:
+            # Start straight away instead of waiting for the next poll
+            self.hass.async_create_task(self.async_request_refresh(), f"{self.name} start streaming")
+
     def ensure_writable(self) -> None:
         """Writable check for service methods."""
         if not self.mug.can_write:
@@ -136,14 +607,49 @@ class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
                 f"Unable to write to {self.mug.data.model_info.device_type.value}",
             )
 
-    async def write_to_storage(self, target_temp: float | None) -> None:
+    async def async_load_storage(self) -> None:
+        """Load the data stored for this device and show its last known state until it is read."""
+        self.persistent_data = await self._async_load_storage() or {}
+        self._storage_loaded = True
+        if (snapshot := self.persistent_data.get("snapshot")) and restore_snapshot(self.mug.data, snapshot):
+            _LOGGER.debug("Restored last known state of %s: %s", self.base_unique_id, self.mug.data)
+            self.restored = True
+
+    async def _async_load_storage(self) -> PersistentData | None:
+        """Load the data stored for this device, moving it over from the storage shared by all devices if needed."""
+        if (data := await self._store.async_load()) is not None:
+            return data
+        # Previously every device shared one file, so this is the backup of whichever device saved last.
+        # It is only moved to the first device loaded, so devices added later don't inherit it.
+        # Entries are set up concurrently, so they take turns to make sure only one of them gets it.
+        lock = self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_LEGACY_STORAGE_LOCK, asyncio.Lock())
+        async with lock:
+            legacy_store: Store[PersistentData] = Store(self.hass, STORAGE_VERSION, DOMAIN)
+            if (data := await legacy_store.async_load()) is not None:
+                _LOGGER.debug("Migrating stored data for %s from shared storage", self.base_unique_id)
+                await self._store.async_save(data)
+                await legacy_store.async_remove()
+        return data
+
+    @callback
+    def write_to_storage(self, target_temp: float | None) -> None:
         """
         Write target temp to file storage.
 
         This is stored to disk, so it can be restored to the entity even if we restart Home Assistant.
+        Saving is delayed, so quickly toggling only writes to disk once.
         """
-        self.persistent_data: PersistentData = {"target_temp_bkp": target_temp}
-        await self._store.async_save(self.persistent_data)
+        self.persistent_data["target_temp_bkp"] = target_temp
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the stored data and a new snapshot of the device after a delay."""
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self) -> PersistentData:
+        """Get the data to save, with a snapshot of the device as it is now."""
+        return {**self.persistent_data, "snapshot": dump_snapshot(self.mug.data)}
 
     @property
     def target_temp(self) -> float:
@@ -164,7 +670,10 @@ class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
         """Handle the device going unavailable."""
         _LOGGER.debug("%s is unavailable", self.mug.model_name)
         self.available = False
-        self.async_update_listeners()
+        # Stop showing the last known state as well
+        self.restored = False
+        self.async_schedule_dispatch()
+        self.live.async_publish()
 
     @callback
     def handle_bluetooth_event(
@@ -173,35 +682,66 @@ class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
         change: BluetoothChange.ADVERTISEMENT,
     ) -> None:
         """Handle a Bluetooth event."""
+        payload = _advertisement_payload(service_info)
+        if self.available and payload == self._last_advertisement:
+            # Nothing new, but the device may have been seen through another adapter
+            self.mug.device = service_info.device
+            self.adverts_skipped += 1
+            return
         _LOGGER.debug(
             "Bluetooth event. Service Info: %s, change: %s",
             service_info,
             change,
         )
+        self._last_advertisement = payload
+        self.adverts_processed += 1
         self.mug.ble_event_callback(service_info.device, service_info.advertisement)
         self.available = True
-        self.async_update_listeners()
-        self.hass.loop.create_task(close_stale_connections(service_info.device))
+        self.async_schedule_dispatch()
+        self.live.async_publish()
+        self._async_close_stale_connections(service_info)
+
+    @callback
+    def _async_close_stale_connections(self, service_info: BluetoothServiceInfoBleak) -> None:
+        """Close stale connections to the device, unless that is already in progress."""
+        if self._stale_task is not None and not self._stale_task.done():
+            self.adverts_coalesced += 1
+            return
+        self._stale_task = self.hass.async_create_background_task(
+            close_stale_connections(service_info.device),
+            f"{self.name} close stale connections",
+        )
 
     @callback
     def _async_handle_callback(self, mug_data: MugData) -> None:
         """Handle a Bluetooth event."""
         _LOGGER.debug("Callback called in Home Assistant")
-        self.async_set_updated_data(mug_data)
+        # Subscribers get changes as they are read, without waiting for the dispatch window
+        self.live.async_publish()
+        if self._polling:
+            # The poll dispatches its own changes
+            return
+        # Pushed changes don't say what changed
+        self.async_schedule_dispatch()
 
     def refresh_from_mug(self) -> None:
-        """Update stored data from mug data and trigger entities."""
+        """Update stored data from mug data and trigger entities after a change was written."""
+        self._last_write = monotonic()
+        # Check back sooner to pick up the effect of the change (this reschedules the next refresh)
+        self.update_interval = self._next_update_interval()
+        self._async_schedule_save()
         self.async_set_updated_data(self.mug.data)
+        self.live.async_publish()
 
     def get_device_attr(self, device_attr: str) -> Any:
         """Get a device attribute by name (recursively) or return None."""
-        value = self.data
-        for attr in device_attr.split("."):
-            try:
-                value = getattr(value, attr)
-            except AttributeError:
-                return None
-        return value
+        return compile_accessor(device_attr)(self.data)
+
+    def _get_live_value(self, field: str) -> Any:
+        """Get the value of a field of the live data."""
+        if field == "available":
+            return self.available
+        return self.get_device_attr(field)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -219,3 +759,12 @@ class MugDataUpdateCoordinator(DataUpdateCoordinator[MugData]):
             sw_version=str(firmware.version) if firmware else None,
             manufacturer=MANUFACTURER,
         )
+
+
+def _advertisement_payload(service_info: BluetoothServiceInfoBleak) -> tuple[Any, ...]:
+    """Get the parts of an advertisement that matter to the device, ignoring the signal strength."""
+    return (
+        tuple(sorted(service_info.manufacturer_data.items())),
+        tuple(sorted(service_info.service_data.items())),
+        tuple(sorted(service_info.service_uuids)),
+    )
@@ -26,6 +26,18 @@ async def async_get_config_entry_diagnostics(
         "info": coordinator.data,
         "state": coordinator.data.liquid_state_display,
         "address": coordinator.mug.device.address,
+        "startup_stages": coordinator.startup_stages,
+        "demanded_attributes": sorted(coordinator.demanded_attributes),
+        "reads": coordinator.planner.as_dict(),
+        "dispatches": {"dispatched": coordinator.dispatches, "saved": coordinator.dispatches_saved},
+        "advertisements": {
+            "processed": coordinator.adverts_processed,
+            "skipped": coordinator.adverts_skipped,
+            "coalesced": coordinator.adverts_coalesced,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "latency": coordinator.metrics.latency_as_dict(),
+        "operations": coordinator.metrics.trace_as_list(),
     }
     if coordinator.mug.debug is True:
         services: dict[str, Any] | None = None
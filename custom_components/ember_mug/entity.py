@@ -8,9 +8,9 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-if TYPE_CHECKING:
-    from collections.abc import Mapping
+from .accessors import compile_accessor
 
+if TYPE_CHECKING:
     from .coordinator import MugDataUpdateCoordinator
 
 
@@ -24,6 +24,8 @@ class BaseMugEntity(CoordinatorEntity):
 
     _domain: str = None  # type: ignore[assignment]
     _attr_has_entity_name = True
+    # Other device attributes the state of the entity depends on
+    _extra_device_attrs: frozenset[str] = frozenset()
 
     def __init__(
         self,
@@ -34,24 +36,34 @@ class BaseMugEntity(CoordinatorEntity):
         super().__init__(coordinator)
         entity_key = self.entity_description.key
         self._device_attr = device_attr
+        self._get_device_attr = compile_accessor(device_attr)
+        self.watched_attrs = frozenset({device_attr.partition(".")[0]}) | self._extra_device_attrs
         self._address = coordinator.mug.device.address
         self._attr_translation_key = entity_key
         self._attr_device_info = coordinator.device_info
         self._attr_unique_id = f"ember_{coordinator.device_type}_{coordinator.base_unique_id}_{entity_key}"
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.available
+    async def async_added_to_hass(self) -> None:
+        """Also listen for changes to the device attributes of this entity, and work out the initial state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_attribute_listener(self.watched_attrs, self._handle_coordinator_update),
+        )
+        self._async_update_attrs()
 
     @property
-    def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return empty dict by default."""
-        return {}
+    def available(self) -> bool:
+        """Return if entity is available, or is showing the last known state until the device is read."""
+        return self.coordinator.available or self.coordinator.restored
 
     @callback
     def _async_update_attrs(self) -> None:
-        """Update the entity attributes."""
+        """
+        Update the entity attributes, once per update rather than every time the state is written.
+
+        Subclasses add their own on top of these, which mark the state as restored until the device is read.
+        """
+        self._attr_extra_state_attributes = {"restored": True} if self.coordinator.restored else {}
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -66,4 +78,4 @@ class BaseMugValueEntity(BaseMugEntity):
     @property
     def native_value(self) -> Any:
         """Return a mug attribute as the state for the sensor."""
-        return self.coordinator.get_device_attr(self._device_attr)
+        return self._get_device_attr(self.coordinator.data)
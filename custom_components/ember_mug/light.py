@@ -42,11 +42,12 @@ class MugLightEntity(BaseMugEntity, LightEntity):
     @property
     def is_on(self) -> bool | None:
         """The light is always on if it is available."""
-        return self.coordinator.available or None
+        return self.available or None
 
     @callback
     def _async_update_attrs(self) -> None:
         """Handle updating _attr values."""
+        super()._async_update_attrs()
         colour = self.coordinator.data.led_colour
         self._attr_brightness = colour.brightness
         self._attr_rgb_color = tuple(colour[:3]) if colour else (255, 255, 255)
@@ -55,7 +56,8 @@ class MugLightEntity(BaseMugEntity, LightEntity):
         """Change the LED colour if defined."""
         _LOGGER.debug("Received turn on with %s", kwargs)
         self.coordinator.ensure_writable()
-        current_colour = self.coordinator.mug.data.led_colour
+        # Build on a colour that is still waiting to be written, so colour and brightness changes merge
+        current_colour = self.coordinator.commands.pending_value("led_colour") or self.coordinator.mug.data.led_colour
         rgb: tuple[int, int, int]
         rgb, brightness = current_colour[:3], current_colour[3]
         if (rgb := kwargs.get(ATTR_RGB_COLOR, rgb)) or (brightness := kwargs.get(ATTR_BRIGHTNESS)):
@@ -63,10 +65,13 @@ class MugLightEntity(BaseMugEntity, LightEntity):
                 brightness = current_colour[3]
             if not rgb:
                 rgb = current_colour[:3]
-            await self.coordinator.mug.set_led_colour(Colour(*rgb, brightness))
             self._attr_rgb_color = tuple(rgb)
             self._attr_brightness = brightness
-            self.coordinator.refresh_from_mug()
+            await self.coordinator.async_queue_write(
+                "led_colour",
+                self.coordinator.mug.set_led_colour,
+                Colour(*rgb, brightness),
+            )
 
     def turn_off(self, **kwargs: Any) -> None:
         """Do nothing, since these lights can't be turned off."""
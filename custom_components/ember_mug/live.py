@@ -0,0 +1,137 @@
+"""Send changes of the device data straight to websocket subscribers, without writing entity states."""
+
+from __future__ import annotations
+
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import LIVE_FIELDS
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Callable, Iterable
+
+# A change of a field: the field, its new value and the time it was seen as a Unix timestamp
+type LiveDelta = tuple[str, Any, float]
+
+_MISSING = object()
+
+
+class LiveSubscriber:
+    """
+    Merge the changes for one subscriber and send them at most once per interval.
+
+    Only the latest value of each field is kept, so a slow subscriber never has more than one
+    message worth of changes waiting, however often the device changes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[list[LiveDelta]], None],
+        fields: frozenset[str],
+        interval: float,
+    ) -> None:
+        """Initialize the subscriber, sending the first changes straight away."""
+        self.hass = hass
+        self._send = send
+        self.fields = fields
+        self.interval = interval
+        self._pending: dict[str, LiveDelta] = {}
+        self._last_sent = float("-inf")
+        self._handle: asyncio.TimerHandle | None = None
+        self.messages = 0
+        self.merged = 0
+
+    @callback
+    def async_add(self, deltas: Iterable[LiveDelta]) -> None:
+        """Add the changes of the subscribed fields, sending them once the interval since the last message passed."""
+        for delta in deltas:
+            if delta[0] not in self.fields:
+                continue
+            if delta[0] in self._pending:
+                self.merged += 1
+            self._pending[delta[0]] = delta
+        if not self._pending or self._handle is not None:
+            return
+        delay = self._last_sent + self.interval - self.hass.loop.time()
+        if delay <= 0:
+            self._async_flush()
+        else:
+            self._handle = self.hass.loop.call_later(delay, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the changes waiting."""
+        self._handle = None
+        deltas = list(self._pending.values())
+        self._pending.clear()
+        self._last_sent = self.hass.loop.time()
+        self.messages += 1
+        self._send(deltas)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the changes waiting, when unsubscribing."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
+
+
+class LiveData:
+    """Find what changed in the live fields of a device and pass it on to the subscribers."""
+
+    def __init__(self, hass: HomeAssistant, get_value: Callable[[str], Any]) -> None:
+        """Initialize without subscribers, getting the value of each field with `get_value`."""
+        self.hass = hass
+        self._get_value = get_value
+        self._subscribers: list[LiveSubscriber] = []
+        # The value of each field last sent to subscribers
+        self._values: dict[str, Any] = {}
+
+    @property
+    def subscribers(self) -> int:
+        """Get the number of subscribers."""
+        return len(self._subscribers)
+
+    @callback
+    def async_publish(self) -> None:
+        """Send the fields that changed since last time to the subscribers, if there are any."""
+        if not self._subscribers:
+            return
+        now = round(time(), 3)
+        deltas: list[LiveDelta] = []
+        for field in LIVE_FIELDS:
+            value = self._get_value(field)
+            if self._values.get(field, _MISSING) != value:
+                self._values[field] = value
+                deltas.append((field, value, now))
+        if deltas:
+            for subscriber in self._subscribers:
+                subscriber.async_add(deltas)
+
+    @callback
+    def async_subscribe(
+        self,
+        send: Callable[[list[LiveDelta]], None],
+        fields: Iterable[str] = LIVE_FIELDS,
+        interval: float = 0,
+    ) -> CALLBACK_TYPE:
+        """Send the current value of the fields, then their changes until unsubscribed."""
+        # Catch up first, so existing subscribers don't miss anything when the values are refreshed
+        self.async_publish()
+        subscriber = LiveSubscriber(self.hass, send, frozenset(fields), interval)
+        self._subscribers.append(subscriber)
+        now = round(time(), 3)
+        self._values = {field: self._get_value(field) for field in LIVE_FIELDS}
+        subscriber.async_add((field, value, now) for field, value in self._values.items())
+
+        @callback
+        def unsubscribe() -> None:
+            subscriber.async_cancel()
+            self._subscribers.remove(subscriber)
+
+        return unsubscribe
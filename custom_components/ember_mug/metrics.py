@@ -0,0 +1,159 @@
+"""Keep track of how Bluetooth operations with the device are going."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from bleak import BleakError
+from homeassistant.util import dt as dt_util
+
+from .const import LATENCY_BUCKETS, OPERATION_TRACE_SIZE
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+METRIC_ATTR = "metrics"
+
+
+class Operation(NamedTuple):
+    """A Bluetooth operation with the device."""
+
+    name: str
+    characteristic: str | None
+    # In milliseconds
+    duration: float
+    outcome: str
+    adapter: str | None
+    started: datetime
+
+
+def get_outcome(error: BaseException | None) -> str:
+    """Describe how an operation went from the error it raised, if any."""
+    if error is None:
+        return "ok"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, BleakError):
+        return "bleak_error"
+    return type(error).__name__
+
+
+class LatencyHistogram:
+    """Count the durations of an operation in buckets."""
+
+    def __init__(self, buckets: tuple[int, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize with the upper bound of each bucket in milliseconds and one more for anything above."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Count a duration in milliseconds."""
+        self.counts[bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Dump the histogram for diagnostics."""
+        labels = [f"<={bucket}" for bucket in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "max": round(self.max, 1),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class MugMetrics:
+    """Counters and timings of the Bluetooth operations with a device."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics with nothing recorded yet."""
+        self.polls = 0
+        # Duration of the last poll that talked to the device, in milliseconds
+        self.poll_latency: float | None = None
+        self.last_success: datetime | None = None
+        self.reads = 0
+        self.writes = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.notifications = 0
+        self._connected_once = False
+        self._last_notification = 0.0
+        # The latest operations, oldest first
+        self.trace: deque[Operation] = deque(maxlen=OPERATION_TRACE_SIZE)
+        self.latency: dict[str, LatencyHistogram] = {}
+
+    def record_poll(self, duration: float) -> None:
+        """Record a successful poll that took `duration` seconds."""
+        self.polls += 1
+        self.poll_latency = round(duration * 1000, 1)
+        self.last_success = dt_util.utcnow()
+
+    def record_operation(
+        self,
+        name: str,
+        characteristic: str | None,
+        duration: float,
+        error: BaseException | None,
+        adapter: str | None,
+    ) -> None:
+        """Add an operation that took `duration` seconds to the trace and the latency of its type."""
+        duration = round(duration * 1000, 1)
+        started = dt_util.utcnow() - timedelta(milliseconds=duration)
+        self.trace.append(Operation(name, characteristic, duration, get_outcome(error), adapter, started))
+        if (histogram := self.latency.get(name)) is None:
+            histogram = self.latency[name] = LatencyHistogram()
+        histogram.add(duration)
+
+    def record_failure(self, error: BaseException) -> None:
+        """Record an operation that timed out or failed."""
+        if isinstance(error, TimeoutError):
+            self.timeouts += 1
+        elif isinstance(error, BleakError):
+            self.errors += 1
+
+    def record_connection(self) -> None:
+        """Record a new connection to the device, the first one isn't a reconnect."""
+        if self._connected_once:
+            self.reconnects += 1
+        self._connected_once = True
+
+    def record_notifications(self, events: dict[int, float]) -> None:
+        """
+        Count the notifications received since last checked from the time of the latest event of each type.
+
+        Repeats of the same event are only seen once, so this is the minimum received.
+        """
+        self.notifications += sum(1 for received in events.values() if received > self._last_notification)
+        self._last_notification = max(events.values(), default=self._last_notification)
+
+    def trace_as_list(self) -> list[dict[str, Any]]:
+        """Dump the latest operations for diagnostics."""
+        return [operation._asdict() for operation in self.trace]
+
+    def latency_as_dict(self) -> dict[str, dict[str, Any]]:
+        """Dump the latency histogram of each type of operation for diagnostics."""
+        return {name: histogram.as_dict() for name, histogram in sorted(self.latency.items())}
+
+    def as_dict(self) -> dict[str, int | float | datetime | None]:
+        """Dump the metrics for diagnostics."""
+        return {
+            "polls": self.polls,
+            "poll_latency": self.poll_latency,
+            "last_success": self.last_success,
+            "reads": self.reads,
+            "writes": self.writes,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "notifications": self.notifications,
+        }
@@ -67,8 +67,7 @@ class MugTargetTempNumberEntity(MugNumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the mug target temp."""
         self.coordinator.ensure_writable()
-        await self.coordinator.mug.set_target_temp(value)
-        self.coordinator.refresh_from_mug()
+        await self.coordinator.async_queue_write("target_temp", self.coordinator.mug.set_target_temp, value)
 
 
 async def async_setup_entry(
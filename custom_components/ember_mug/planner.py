@@ -0,0 +1,75 @@
+"""Plan which attributes need to be read from the device."""
+
+from __future__ import annotations
+
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from .const import ATTRIBUTE_MAX_AGE, PLAN_SLACK
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+    from datetime import timedelta
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ReadPlanner:
+    """Keep track of when each attribute was last read and which ones are past their maximum age."""
+
+    def __init__(self) -> None:
+        """Initialize the planner with nothing read yet."""
+        self._last_read: dict[str, float] = {}
+        self.reads_planned = 0
+        self.reads_skipped = 0
+
+    def mark_read(self, attrs: Iterable[str], now: float | None = None) -> None:
+        """Record that these attributes were just read from the device."""
+        now = monotonic() if now is None else now
+        for attr in attrs:
+            self._last_read[attr] = now
+
+    def age(self, attr: str, now: float | None = None) -> float | None:
+        """Get how long ago the attribute was read in seconds, or None if it never was."""
+        if (last_read := self._last_read.get(attr)) is None:
+            return None
+        return (monotonic() if now is None else now) - last_read
+
+    def plan(
+        self,
+        attrs: Collection[str],
+        relaxed: Collection[str] = (),
+        relaxed_max_age: timedelta | None = None,
+        exclude: Collection[str] = (),
+        *,
+        always: Collection[str] = (),
+        now: float | None = None,
+    ) -> list[str]:
+        """
+        Get the attributes that are past their maximum age, highest priority first.
+
+        Attributes in `relaxed` use `relaxed_max_age` instead, if it is longer than their own,
+        attributes in `exclude` are skipped because they are being read some other way
+        and attributes in `always` are planned whatever their age.
+        """
+        now = monotonic() if now is None else now
+        planned: list[str] = []
+        for attr, max_age in ATTRIBUTE_MAX_AGE.items():
+            if attr not in attrs or attr in exclude:
+                continue
+            if relaxed_max_age is not None and attr in relaxed:
+                max_age = max(max_age, relaxed_max_age)  # noqa: PLW2901
+            age = self.age(attr, now)
+            if attr in always or age is None or age + PLAN_SLACK >= max_age.total_seconds():
+                planned.append(attr)
+        skipped = len(attrs) - len(planned)
+        self.reads_planned += len(planned)
+        self.reads_skipped += skipped
+        _LOGGER.debug("Planned reads: %s, skipped %s reads", planned, skipped)
+        return planned
+
+    def as_dict(self) -> dict[str, int]:
+        """Dump how many reads were planned and skipped for diagnostics."""
+        return {"planned": self.reads_planned, "skipped": self.reads_skipped}
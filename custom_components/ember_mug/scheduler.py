@@ -0,0 +1,192 @@
+"""Share the connection slots of each Bluetooth adapter between all devices."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from enum import IntEnum
+from itertools import count
+from typing import TYPE_CHECKING
+
+from bleak import BleakError
+
+from .const import ADAPTER_CONNECTION_SLOTS, DATA_SCHEDULER, DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ADAPTER = "default"
+
+
+class SlotPriority(IntEnum):
+    """Priority of an operation waiting for a slot, lowest goes first."""
+
+    WRITE = 0
+    SETUP = 1
+    POLL = 2
+
+
+class SlotTimeoutError(Exception):
+    """Raised when no slot became free in time."""
+
+
+class _Ticket:
+    """An operation waiting for a slot."""
+
+    __slots__ = ("device", "disconnect", "priority", "sequence")
+
+    def __init__(
+        self,
+        device: str,
+        priority: SlotPriority,
+        sequence: int,
+        disconnect: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Store details of the waiting operation."""
+        self.device = device
+        self.priority = priority
+        self.sequence = sequence
+        self.disconnect = disconnect
+
+    def sort_key(self) -> tuple[int, int]:
+        """Sort by priority first and then by the order they arrived in."""
+        return self.priority, self.sequence
+
+
+class AdapterSlots:
+    """Connection slots of a single adapter or proxy."""
+
+    def __init__(self, slots: int) -> None:
+        """Initialize with the number of simultaneous connections the adapter supports."""
+        self.slots = slots
+        self.condition = asyncio.Condition()
+        self.waiting: list[_Ticket] = []
+        # Devices holding a connection, least recently used first
+        self.connected: dict[str, Callable[[], Awaitable[None]]] = {}
+        self.active: set[str] = set()
+
+    def can_run(self, device: str) -> bool:
+        """Check if the device could be given a slot right now."""
+        if device in self.active:
+            # Only one operation per device at a time
+            return False
+        if device in self.connected or len(self.connected) < self.slots:
+            return True
+        # Another device's connection could be closed to make room
+        return any(other not in self.active for other in self.connected)
+
+    def next_ticket(self) -> _Ticket | None:
+        """Get the highest priority ticket that could run now."""
+        for ticket in sorted(self.waiting, key=_Ticket.sort_key):
+            if self.can_run(ticket.device):
+                return ticket
+        return None
+
+    def reserve(self, ticket: _Ticket) -> Callable[[], Awaitable[None]] | None:
+        """Give the ticket a slot, returning the disconnect of another device if it had to make room."""
+        self.waiting.remove(ticket)
+        evicted = None
+        if ticket.device not in self.connected and len(self.connected) >= self.slots:
+            idle = next(other for other in self.connected if other not in self.active)
+            _LOGGER.debug("Closing connection to %s to make room for %s", idle, ticket.device)
+            evicted = self.connected.pop(idle)
+        # Move to the end as the most recently used
+        self.connected.pop(ticket.device, None)
+        self.connected[ticket.device] = ticket.disconnect
+        self.active.add(ticket.device)
+        return evicted
+
+
+class ConnectionScheduler:
+    """
+    Hand out connection slots per adapter to all the devices.
+
+    Each adapter (or proxy) can only hold a few connections at once, so devices wait for a slot
+    before talking to the device, writes go before polls, and waiting devices are served in the
+    order they arrived. If all slots are held by idle connections, the least recently used is closed.
+    """
+
+    def __init__(self, slots: int = ADAPTER_CONNECTION_SLOTS) -> None:
+        """Initialize the scheduler without any adapters."""
+        self._slots = slots
+        self._adapters: dict[str, AdapterSlots] = {}
+        self._sequence = count()
+
+    def _get_adapter(self, adapter: str | None) -> AdapterSlots:
+        """Get the slots for the given adapter, creating them if needed."""
+        key = adapter or DEFAULT_ADAPTER
+        if (adapter_slots := self._adapters.get(key)) is None:
+            adapter_slots = self._adapters[key] = AdapterSlots(self._slots)
+        return adapter_slots
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        adapter: str | None,
+        device: str,
+        priority: SlotPriority,
+        disconnect: Callable[[], Awaitable[None]],
+        max_wait: float,
+    ) -> AsyncIterator[None]:
+        """Wait for a connection slot for the device on the adapter and hold it until done."""
+        adapter_slots = self._get_adapter(adapter)
+        ticket = _Ticket(device, priority, next(self._sequence), disconnect)
+        async with adapter_slots.condition:
+            adapter_slots.waiting.append(ticket)
+            try:
+                async with asyncio.timeout(max_wait):
+                    await adapter_slots.condition.wait_for(lambda: adapter_slots.next_ticket() is ticket)
+            except BaseException as e:
+                # Timed out or cancelled, so let the others go ahead
+                adapter_slots.waiting.remove(ticket)
+                adapter_slots.condition.notify_all()
+                if isinstance(e, TimeoutError):
+                    raise SlotTimeoutError(
+                        f"No connection slot became available on {adapter or DEFAULT_ADAPTER} for {device}",
+                    ) from None
+                raise
+            evicted = adapter_slots.reserve(ticket)
+            adapter_slots.condition.notify_all()
+
+        try:
+            if evicted is not None:
+                with contextlib.suppress(TimeoutError, BleakError):
+                    await evicted()
+            yield
+        finally:
+            async with adapter_slots.condition:
+                adapter_slots.active.discard(device)
+                adapter_slots.condition.notify_all()
+
+    async def async_release(self, adapter: str | None, device: str) -> None:
+        """Forget the connection of a device that disconnected, freeing its slot."""
+        adapter_slots = self._get_adapter(adapter)
+        async with adapter_slots.condition:
+            if adapter_slots.connected.pop(device, None) is not None:
+                adapter_slots.condition.notify_all()
+
+    def as_dict(self) -> dict[str, dict[str, list[str] | int]]:
+        """Dump the state of each adapter for diagnostics."""
+        return {
+            adapter: {
+                "slots": adapter_slots.slots,
+                "connected": list(adapter_slots.connected),
+                "active": sorted(adapter_slots.active),
+                "waiting": len(adapter_slots.waiting),
+            }
+            for adapter, adapter_slots in self._adapters.items()
+        }
+
+
+def get_scheduler(hass: HomeAssistant) -> ConnectionScheduler:
+    """Get the scheduler shared by all devices, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_SCHEDULER)) is None:
+        scheduler = domain_data[DATA_SCHEDULER] = ConnectionScheduler()
+    return scheduler
@@ -62,7 +62,7 @@ class MugSelectEntity(BaseMugEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return a mug attribute as the state for the current option."""
-        option = self.coordinator.get_device_attr(self._device_attr)
+        option = self._get_device_attr(self.coordinator.data)
         return option.value if isinstance(option, Enum) else option
 
 
@@ -82,8 +82,11 @@ class MugTempUnitSelectEntity(MugSelectEntity):
         option: Literal["°C", "°F"] | UnitOfTemperature,
     ) -> None:
         """Change the selected option."""
-        await self.coordinator.mug.set_temperature_unit(option)
-        self.coordinator.refresh_from_mug()
+        await self.coordinator.async_queue_write(
+            "temperature_unit",
+            self.coordinator.mug.set_temperature_unit,
+            option,
+        )
 
 
 class MugVolumeLevelSelectEntity(MugSelectEntity):
@@ -104,14 +107,14 @@ class MugVolumeLevelSelectEntity(MugSelectEntity):
         self.coordinator.ensure_writable()
         if isinstance(option, str):
             option = VolumeLevel(option)
-        await self.coordinator.mug.set_volume_level(option)
-        self.coordinator.refresh_from_mug()
+        await self.coordinator.async_queue_write("volume_level", self.coordinator.mug.set_volume_level, option)
 
 
 class MugTemperaturePresetSelectEntity(MugSelectEntity):
     """Configurable SelectEntity to set the mug temperature from a list of presets."""
 
     _attr_icon = "mdi:format-list-bulleted"
+    _extra_device_attrs = frozenset({"target_temp"})
 
     def __init__(
         self,
@@ -147,8 +150,7 @@ class MugTemperaturePresetSelectEntity(MugSelectEntity):
         """Change the target temp of the mug based on preset."""
         if not (target_temp := self._presets.get(option)):
             raise ValueError("Invalid Option")
-        await self.coordinator.mug.set_target_temp(target_temp)
-        self.coordinator.refresh_from_mug()
+        await self.coordinator.async_queue_write("target_temp", self.coordinator.mug.set_target_temp, target_temp)
 
 
 async def async_setup_entry(
@@ -12,11 +12,22 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import ATTR_BATTERY_CHARGING, PERCENTAGE, UnitOfTemperature
+from homeassistant.const import ATTR_BATTERY_CHARGING, PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import (
     ATTR_BATTERY_VOLTAGE,
+    CONF_LEVEL_DEADBAND,
+    CONF_LEVEL_PRECISION,
+    CONF_STATE_MAX_AGE,
+    CONF_TEMP_DEADBAND,
+    CONF_TEMP_PRECISION,
+    DEFAULT_LEVEL_DEADBAND,
+    DEFAULT_LEVEL_PRECISION,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TEMP_PRECISION,
     ICON_DEFAULT,
     ICON_EMPTY,
     ICON_UNAVAILABLE,
@@ -25,7 +36,9 @@ from .const import (
     LIQUID_STATE_TEMP_ICONS,
     LiquidStateValue,
 )
-from .entity import BaseMugValueEntity
+from .entity import BaseMugEntity
+from .metrics import METRIC_ATTR
+from .state_filter import StateFilter
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -44,12 +57,12 @@ SENSOR_TYPES = {
     "liquid_level": SensorEntityDescription(
         key="liquid_level",
         icon="mdi:cup-water",
-        suggested_display_precision=0,
+        suggested_display_precision=DEFAULT_LEVEL_PRECISION,
         native_unit_of_measurement=PERCENTAGE,
     ),
     "current_temp": SensorEntityDescription(
         key="current_temp",
-        suggested_display_precision=1,
+        suggested_display_precision=DEFAULT_TEMP_PRECISION,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -64,8 +77,37 @@ SENSOR_TYPES = {
     ),
 }
 
+# Counters of Bluetooth operations with the device
+METRIC_COUNTERS = ("reads", "writes", "timeouts", "errors", "reconnects", "notifications")
+
+METRIC_SENSOR_TYPES = {
+    "poll_latency": SensorEntityDescription(
+        key="poll_latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "last_success": SensorEntityDescription(
+        key="last_success",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    **{
+        counter: SensorEntityDescription(
+            key=counter,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        )
+        for counter in METRIC_COUNTERS
+    },
+}
+
 
-class EmberMugSensor(BaseMugValueEntity, SensorEntity):
+class EmberMugSensor(BaseMugEntity, SensorEntity):
     """Representation of a Mug sensor."""
 
     _domain = "sensor"
@@ -75,43 +117,78 @@ class EmberMugSensor(BaseMugValueEntity, SensorEntity):
         coordinator: MugDataUpdateCoordinator,
         device_attr: str,
     ) -> None:
-        """Initialize the Mug sensor."""
+        """Initialize the Mug sensor and the parts of its state that only depend on the model."""
         self.entity_description = SENSOR_TYPES[device_attr]
         super().__init__(coordinator, device_attr)
+        self._model_info = coordinator.data.model_info
+        self._async_update_model_attrs()
+
+    @callback
+    def _async_update_model_attrs(self) -> None:
+        """Update the parts of the state that only depend on the model, which is only known later for some devices."""
+
+    @callback
+    def _async_check_model(self) -> None:
+        """Update the parts of the state depending on the model if it changed."""
+        if self.coordinator.data.model_info is not self._model_info:
+            self._model_info = self.coordinator.data.model_info
+            self._async_update_model_attrs()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state from the device attribute."""
+        super()._async_update_attrs()
+        self._async_check_model()
+        self._attr_native_value = self._get_device_attr(self.coordinator.data)
 
 
 class EmberMugStateSensor(EmberMugSensor):
     """Base Mug State Sensor."""
 
-    @property
-    def icon(self) -> str:
-        """Change icon based on state."""
-        state = self.state
-        if state is None or self.coordinator.available is False:
-            return ICON_UNAVAILABLE
-        if state == LiquidStateValue.EMPTY:
-            return ICON_EMPTY
-        return ICON_DEFAULT
+    _extra_device_attrs = frozenset({"firmware"})
+    # Only shown in debug mode, so only read then
+    _debug_device_attrs = frozenset({"date_time_zone", "udsk", "dsk"})
 
-    @property
-    def native_value(self) -> str | None:
-        """Return liquid state key."""
-        raw_value = super().native_value
+    def __init__(
+        self,
+        coordinator: MugDataUpdateCoordinator,
+        device_attr: str,
+    ) -> None:
+        """Initialize the Mug state sensor, also depending on the debug attributes in debug mode."""
+        super().__init__(coordinator, device_attr)
+        if coordinator.data.debug:
+            self.watched_attrs |= self._debug_device_attrs
+
+    @callback
+    def _async_update_model_attrs(self) -> None:
+        """Format the colour of the device."""
+        colour = self._model_info.colour
+        self._colour = colour.value.lower().replace(" ", "-") if colour else "unknown"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Map the liquid state to its key, with the icon and device specific state attributes."""
+        super()._async_update_attrs()
+        raw_value = self._attr_native_value
+        value = None
         if raw_value in LIQUID_STATE_MAPPING:
-            return LIQUID_STATE_MAPPING[raw_value].value
-        if raw_value is not None:
+            value = LIQUID_STATE_MAPPING[raw_value].value
+        elif raw_value is not None:
             logging.debug('Value "%s" was not  found in mapping: %s', raw_value, LIQUID_STATE_MAPPING)
-        return None
+        self._attr_native_value = value
+
+        if value is None or not self.available:
+            self._attr_icon = ICON_UNAVAILABLE
+        elif value == LiquidStateValue.EMPTY:
+            self._attr_icon = ICON_EMPTY
+        else:
+            self._attr_icon = ICON_DEFAULT
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return device specific state attributes."""
         data = self.coordinator.data
-        colour = data.model_info.colour
         attrs = {
             "firmware_info": data.firmware,
             "raw_state": data.liquid_state,
-            "colour": colour.value.lower().replace(" ", "-") if colour else "unknown",
+            "colour": self._colour,
         }
         if data.debug:
             attrs |= {
@@ -119,23 +196,63 @@ class EmberMugStateSensor(EmberMugSensor):
                 "udsk": data.udsk,
                 "dsk": data.dsk,
             }
-        return attrs | dict(super().extra_state_attributes)
+        self._attr_extra_state_attributes = attrs | self._attr_extra_state_attributes
+
+
+class EmberMugFilteredSensor(EmberMugSensor):
+    """Sensor that only writes its state when the value moved past the deadband, or changed after a while."""
+
+    def __init__(
+        self,
+        coordinator: MugDataUpdateCoordinator,
+        device_attr: str,
+        state_filter: StateFilter,
+    ) -> None:
+        """Initialize the sensor with its filter."""
+        super().__init__(coordinator, device_attr)
+        self._state_filter = state_filter
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current value, so it is written when added."""
+        self._async_check_model()
+        self._state_filter.update(self._get_value(), self._filter_key())
+        await super().async_added_to_hass()
+
+    def _get_value(self) -> float | None:
+        """Get the unfiltered value."""
+        return self._get_device_attr(self.coordinator.data)
 
+    def _filter_key(self) -> tuple[Any, ...]:
+        """Get the rest of the state, any change to which is written straight away."""
+        return (self.available, self.coordinator.restored, self._model_info)
 
-class EmberMugLiquidLevelSensor(EmberMugSensor):
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Show the last value that was worth writing."""
+        super()._async_update_attrs()
+        self._attr_native_value = self._state_filter.value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only update and write the state if the filter lets the change through."""
+        # The value can depend on the model, like the max liquid level
+        self._async_check_model()
+        if self._state_filter.update(self._get_value(), self._filter_key()):
+            self._async_update_attrs()
+            self.async_write_ha_state()
+
+
+class EmberMugLiquidLevelSensor(EmberMugFilteredSensor):
     """Liquid Level Sensor."""
 
-    @property
-    def max_level(self) -> int:
+    @callback
+    def _async_update_model_attrs(self) -> None:
         """Max level is different for travel mug."""
-        if self.coordinator.mug.data.model_info.device_type == DeviceType.TRAVEL_MUG:
-            return 100
-        return 30
+        self.max_level = 100 if self._model_info.device_type == DeviceType.TRAVEL_MUG else 30
 
-    @property
-    def native_value(self) -> float | int:
+    def _get_value(self) -> float | int:
         """Return information about the liquid level."""
-        liquid_level: float | None = super().native_value
+        liquid_level: float | None = super()._get_value()
         if liquid_level:
             # 30 -> Full (100 for Travel Mug)
             # 5, 6 -> Low
@@ -143,49 +260,91 @@ class EmberMugLiquidLevelSensor(EmberMugSensor):
             return liquid_level / self.max_level * 100
         return 0
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return device specific state attributes."""
-        return {
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the device specific state attributes."""
+        super()._async_update_attrs()
+        self._attr_extra_state_attributes = {
             "raw_liquid_level": self.coordinator.data.liquid_level,
-            "capacity": self.coordinator.data.model_info.capacity,
-            **super().extra_state_attributes,
+            "capacity": self._model_info.capacity,
+            **self._attr_extra_state_attributes,
         }
 
 
-class EmberMugTemperatureSensor(EmberMugSensor):
+class EmberMugTemperatureSensor(EmberMugFilteredSensor):
     """Mug Temperature sensor."""
 
-    @property
-    def icon(self) -> str | None:
-        """Set icon based on temperature."""
-        if self._device_attr != "current_temp":
-            return "mdi:thermometer"
-        icon = LIQUID_STATE_TEMP_ICONS.get(
-            self.coordinator.data.liquid_state,
-            "thermometer",
-        )
-        return f"mdi:{icon}"
+    _extra_device_attrs = frozenset({"liquid_state"})
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return device specific state attributes."""
-        return {"native_value": self.coordinator.data.current_temp, **super().extra_state_attributes}
+    def _filter_key(self) -> tuple[Any, ...]:
+        """Also write changes of the liquid state straight away, as the icon follows it."""
+        return (*super()._filter_key(), self.coordinator.data.liquid_state)
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Set the icon based on the temperature, and the device specific state attributes."""
+        super()._async_update_attrs()
+        if self._device_attr != "current_temp":
+            self._attr_icon = "mdi:thermometer"
+        else:
+            icon = LIQUID_STATE_TEMP_ICONS.get(
+                self.coordinator.data.liquid_state,
+                "thermometer",
+            )
+            self._attr_icon = f"mdi:{icon}"
+        self._attr_extra_state_attributes = {
+            "native_value": self.coordinator.data.current_temp,
+            **self._attr_extra_state_attributes,
+        }
 
 
 class EmberMugBatterySensor(EmberMugSensor):
     """Mug Battery Sensor."""
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return device specific state attributes."""
+    _extra_device_attrs = frozenset({"battery_voltage"})
+
+    @callback
+    def _async_update_model_attrs(self) -> None:
+        """Check whether the device reports its battery voltage."""
+        self._has_battery_voltage = "battery_voltage" in self._model_info.device_attributes
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the device specific state attributes."""
+        super()._async_update_attrs()
         data = self.coordinator.data
         attrs = {
             ATTR_BATTERY_CHARGING: data.battery.on_charging_base if data.battery else None,
         }
-        if self.coordinator.mug.has_attribute("battery_voltage"):
+        if self._has_battery_voltage:
             attrs[ATTR_BATTERY_VOLTAGE] = data.battery_voltage
-        return attrs | dict(super().extra_state_attributes)
+        self._attr_extra_state_attributes = attrs | self._attr_extra_state_attributes
+
+
+class EmberMugMetricSensor(BaseMugEntity, SensorEntity):
+    """Diagnostic sensor for how Bluetooth operations with the device are going."""
+
+    _domain = "sensor"
+
+    def __init__(
+        self,
+        coordinator: MugDataUpdateCoordinator,
+        metric: str,
+    ) -> None:
+        """Initialize the metric sensor."""
+        self.entity_description = METRIC_SENSOR_TYPES[metric]
+        super().__init__(coordinator, f"{METRIC_ATTR}.{metric}")
+
+    @property
+    def available(self) -> bool:
+        """Metrics are most useful while the device is unavailable, so they always are."""
+        return True
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the metric from the coordinator."""
+        super()._async_update_attrs()
+        self._attr_native_value = self._get_device_attr(self.coordinator)
 
 
 async def async_setup_entry(
@@ -197,10 +356,23 @@ async def async_setup_entry(
     if entry.entry_id is None:
         raise ValueError("Missing config entry ID")
     coordinator = entry.runtime_data
-    entities: list[EmberMugSensor] = [
+    options = entry.options
+    max_age = options.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE)
+    level_filter = StateFilter(
+        options.get(CONF_LEVEL_PRECISION, DEFAULT_LEVEL_PRECISION),
+        options.get(CONF_LEVEL_DEADBAND, DEFAULT_LEVEL_DEADBAND),
+        max_age,
+    )
+    temp_filter = StateFilter(
+        options.get(CONF_TEMP_PRECISION, DEFAULT_TEMP_PRECISION),
+        options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+        max_age,
+    )
+    entities: list[SensorEntity] = [
         EmberMugStateSensor(coordinator, "liquid_state"),
-        EmberMugLiquidLevelSensor(coordinator, "liquid_level"),
-        EmberMugTemperatureSensor(coordinator, "current_temp"),
+        EmberMugLiquidLevelSensor(coordinator, "liquid_level", level_filter),
+        EmberMugTemperatureSensor(coordinator, "current_temp", temp_filter),
         EmberMugBatterySensor(coordinator, "battery.percent"),
     ]
+    entities += [EmberMugMetricSensor(coordinator, metric) for metric in METRIC_SENSOR_TYPES]
     async_add_entities(entities)
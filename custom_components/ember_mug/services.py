@@ -0,0 +1,71 @@
+"""Services of the Ember Mug integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    ATTR_DURATION,
+    DOMAIN,
+    SERVICE_START_STREAMING,
+    SERVICE_STOP_STREAMING,
+    STREAM_DEFAULT_DURATION,
+    STREAM_MAX_DURATION,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import MugDataUpdateCoordinator
+
+# Streaming started by the services is one lease per device, so starting again renews it
+SERVICE_LEASE = "service"
+
+START_STREAMING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=STREAM_DEFAULT_DURATION): vol.All(
+            cv.time_period,
+            vol.Range(min=timedelta(seconds=1), max=STREAM_MAX_DURATION),
+        ),
+    },
+)
+STOP_STREAMING_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant, device_id: str) -> MugDataUpdateCoordinator:
+    """Get the coordinator of a loaded device from its device ID."""
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry_id in device.config_entries:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if entry and entry.domain == DOMAIN and entry.state is ConfigEntryState.LOADED:
+                return entry.runtime_data
+    raise ServiceValidationError(f"No loaded Ember device with ID {device_id}")
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    @callback
+    def start_streaming(call: ServiceCall) -> None:
+        """Stream the device at a high rate for a while."""
+        coordinator = async_get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        coordinator.streams.async_acquire(SERVICE_LEASE, call.data[ATTR_DURATION])
+
+    @callback
+    def stop_streaming(call: ServiceCall) -> None:
+        """Stop the streaming started by the service, websocket subscribers keep theirs."""
+        coordinator = async_get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        coordinator.streams.async_release(SERVICE_LEASE)
+
+    hass.services.async_register(DOMAIN, SERVICE_START_STREAMING, start_streaming, START_STREAMING_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_STOP_STREAMING, stop_streaming, STOP_STREAMING_SCHEMA)
@@ -0,0 +1,113 @@
+"""Save and restore what is known about a device, so less has to be read from it on startup."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, TypedDict
+
+from ember_mug.consts import DeviceColour, DeviceModel, TemperatureUnit, VolumeLevel
+from ember_mug.data import Colour, ModelInfo, MugFirmwareInfo, MugMeta
+
+if TYPE_CHECKING:
+    from ember_mug.data import MugData
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device attributes included in the snapshot
+SNAPSHOT_ATTRS = frozenset(
+    {"firmware", "meta", "led_colour", "name", "volume_level", "temperature_unit", "target_temp"},
+)
+# Device attributes included in the static info
+STATIC_INFO_ATTRS = frozenset({"firmware", "meta", "dsk", "udsk"})
+
+
+class MugSnapshot(TypedDict):
+    """The last known values of attributes that rarely change, in a form that can be stored as JSON."""
+
+    model: str | None
+    colour: str | None
+    firmware: dict[str, int] | None
+    meta: dict[str, str] | None
+    led_colour: list[int] | None
+    name: str
+    volume_level: str | None
+    temperature_unit: str
+    target_temp: float
+
+
+class StaticInfo(TypedDict):
+    """Attributes that never change for a device unless its firmware is updated."""
+
+    firmware: dict[str, int]
+    meta: dict[str, str] | None
+    dsk: str
+    udsk: str | None
+
+
+def dump_static_info(data: MugData) -> StaticInfo | None:
+    """Get the static info of the device, if the firmware is known."""
+    if data.firmware is None:
+        return None
+    return {
+        "firmware": data.firmware.as_dict(),
+        "meta": data.meta.as_dict() if data.meta else None,
+        "dsk": data.dsk,
+        "udsk": data.udsk,
+    }
+
+
+def restore_static_info(data: MugData, static_info: StaticInfo) -> bool:
+    """Restore the static info if it was saved for the same firmware as the device has now."""
+    if data.firmware is None or static_info.get("firmware") != data.firmware.as_dict():
+        return False
+    try:
+        data.meta = MugMeta(**static_info["meta"]) if static_info["meta"] else None
+        data.dsk = static_info["dsk"]
+        data.udsk = static_info["udsk"]
+    except (KeyError, TypeError) as e:
+        _LOGGER.debug("Unable to restore static info %s: %s", static_info, e)
+        return False
+    return True
+
+
+def dump_snapshot(data: MugData) -> MugSnapshot:
+    """Take a snapshot of the device data."""
+    return {
+        "model": data.model_info.model,
+        "colour": data.model_info.colour,
+        "firmware": data.firmware.as_dict() if data.firmware else None,
+        "meta": data.meta.as_dict() if data.meta else None,
+        "led_colour": list(data.led_colour) if data.led_colour else None,
+        "name": data.name,
+        "volume_level": data.volume_level,
+        "temperature_unit": data.temperature_unit,
+        "target_temp": data.target_temp,
+    }
+
+
+def restore_snapshot(data: MugData, snapshot: MugSnapshot) -> bool:
+    """
+    Restore a snapshot into the device data, returning whether it could be restored.
+
+    The model from the advertisement is kept if it is known, since it is more recent.
+    """
+    try:
+        if data.model_info.model is None and snapshot["model"]:
+            colour = DeviceColour(snapshot["colour"]) if snapshot["colour"] else None
+            data.model_info = ModelInfo(DeviceModel(snapshot["model"]), colour)
+        if snapshot["firmware"]:
+            data.firmware = MugFirmwareInfo(**snapshot["firmware"])
+        if snapshot["meta"]:
+            data.meta = MugMeta(**snapshot["meta"])
+        if snapshot["led_colour"]:
+            data.led_colour = Colour(*snapshot["led_colour"])
+        if snapshot["volume_level"]:
+            data.volume_level = VolumeLevel(snapshot["volume_level"])
+        data.name = snapshot["name"]
+        data.temperature_unit = TemperatureUnit(snapshot["temperature_unit"])
+        data.target_temp = snapshot["target_temp"]
+    except (KeyError, TypeError, ValueError) as e:
+        _LOGGER.debug("Unable to restore snapshot %s: %s", snapshot, e)
+        return False
+    return True
@@ -0,0 +1,57 @@
+"""Filter small changes of sensor values, so noise doesn't write a new state every time."""
+
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any
+
+# Allow for float errors when comparing the change with the deadband
+_EPSILON = 1e-9
+
+
+class StateFilter:
+    """
+    Decide whether a new value of a sensor is worth writing.
+
+    The value is rounded to `precision` decimals, then only written if it moved by at least `deadband` since the
+    last written value, or changed at all once that was `max_age` seconds ago. Any change of the rest of the state
+    (passed as `key`, like availability) is always written.
+    """
+
+    def __init__(self, precision: int, deadband: float, max_age: float) -> None:
+        """Initialize without anything written yet."""
+        self.precision = precision
+        self.deadband = deadband
+        self.max_age = max_age
+        # The last written value and key
+        self.value: float | None = None
+        self._key: Any = None
+        self._written_at: float | None = None
+        self.suppressed = 0
+
+    def quantize(self, value: float | None) -> float | None:
+        """Round the value to the precision, to an int without decimals."""
+        if value is None:
+            return None
+        return round(value, self.precision) if self.precision else round(value)
+
+    def update(self, value: float | None, key: Any = None) -> bool:
+        """Take a new value, returning whether it should be written."""
+        value = self.quantize(value)
+        now = monotonic()
+        if self._written_at is None or key != self._key:
+            changed = True
+        elif value == self.value:
+            changed = False
+        else:
+            changed = (
+                value is None
+                or self.value is None
+                or abs(value - self.value) >= self.deadband - _EPSILON
+                or now - self._written_at >= self.max_age
+            )
+        if not changed:
+            self.suppressed += 1
+            return False
+        self.value, self._key, self._written_at = value, key, now
+        return True
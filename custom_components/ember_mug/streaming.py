@@ -0,0 +1,83 @@
+"""Leases that keep a device in high-rate streaming mode until they expire or are released."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from datetime import datetime, timedelta
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StreamLeases:
+    """
+    Keep track of who wants the device to stream and for how long.
+
+    The device streams while there is at least one lease. A lease with a duration is released
+    automatically once it expires, others (like websocket subscriptions) when the holder leaves.
+    """
+
+    def __init__(self, hass: HomeAssistant, on_change: Callable[[bool], None]) -> None:
+        """Initialize without any leases, calling `on_change` when streaming starts or stops."""
+        self.hass = hass
+        self._on_change = on_change
+        # Holder of each lease, with the callback cancelling its expiry if it has one
+        self._leases: dict[Hashable, CALLBACK_TYPE | None] = {}
+        self.leases_granted = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether the device should be streaming."""
+        return bool(self._leases)
+
+    @callback
+    def async_acquire(self, holder: Hashable, duration: timedelta | None = None) -> CALLBACK_TYPE:
+        """Take out or renew a lease, returning a callback to release it."""
+        was_active = self.active
+        self._cancel_expiry(holder)
+        cancel_expiry = None
+        if duration is not None:
+            cancel_expiry = async_call_later(self.hass, duration, partial(self._async_expire, holder))
+        self._leases[holder] = cancel_expiry
+        self.leases_granted += 1
+        _LOGGER.debug("Streaming lease for %s, expires in %s", holder, duration)
+        if not was_active:
+            self._on_change(True)
+        return partial(self.async_release, holder)
+
+    @callback
+    def async_release(self, holder: Hashable) -> None:
+        """Release the lease, stopping the streaming if it was the last one."""
+        if holder not in self._leases:
+            return
+        self._cancel_expiry(holder)
+        del self._leases[holder]
+        _LOGGER.debug("Streaming lease for %s released", holder)
+        if not self.active:
+            self._on_change(False)
+
+    @callback
+    def _async_expire(self, holder: Hashable, _now: datetime) -> None:
+        """Release a lease that expired."""
+        self._leases[holder] = None
+        self.async_release(holder)
+
+    def _cancel_expiry(self, holder: Hashable) -> None:
+        """Cancel the expiry of the lease, if it has one."""
+        if cancel_expiry := self._leases.get(holder):
+            cancel_expiry()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Release all leases without notifying, when shutting down."""
+        for holder in list(self._leases):
+            self._cancel_expiry(holder)
+        self._leases.clear()
@@ -61,22 +61,23 @@ class MugTemperatureControlEntity(MugSwitchEntity):
         """It is on if the target temp is not zero."""
         return bool(self.coordinator.mug.data.target_temp)
 
+    def _target_temp(self) -> float:
+        """Get the target temp, or the one still waiting to be written, so quick toggles build on each other."""
+        pending = self.coordinator.commands.pending_value("target_temp")
+        return self.coordinator.mug.data.target_temp if pending is None else pending
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn heating/cooling on if there is a stored target temp."""
         self.coordinator.ensure_writable()
-        if not self.coordinator.mug.data.target_temp and (
-            stored_temp := self.coordinator.persistent_data.get("target_temp_bkp")
-        ):
-            await self.coordinator.mug.set_target_temp(stored_temp)
-            self.coordinator.refresh_from_mug()
+        if not self._target_temp() and (stored_temp := self.coordinator.persistent_data.get("target_temp_bkp")):
+            await self.coordinator.async_queue_write("target_temp", self.coordinator.mug.set_target_temp, stored_temp)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn heating/cooling off if it is not already."""
         self.coordinator.ensure_writable()
-        if target_temp := self.coordinator.mug.data.target_temp:
-            await self.coordinator.write_to_storage(target_temp)
-            await self.coordinator.mug.set_target_temp(0)
-            self.coordinator.refresh_from_mug()
+        if target_temp := self._target_temp():
+            self.coordinator.write_to_storage(target_temp)
+            await self.coordinator.async_queue_write("target_temp", self.coordinator.mug.set_target_temp, 0)
 
 
 async def async_setup_entry(
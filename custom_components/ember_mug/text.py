@@ -54,7 +54,7 @@ class MugTextEntity(BaseMugValueEntity, TextEntity):
     async def async_set_value(self, value: str) -> None:
         """Set the mug name."""
         self.coordinator.ensure_writable()
-        await self.coordinator.mug.set_name(value)
+        await self.coordinator.async_queue_write("name", self.coordinator.mug.set_name, value)
 
 
 async def async_setup_entry(
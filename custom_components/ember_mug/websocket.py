@@ -0,0 +1,91 @@
+"""Websocket commands of the Ember Mug integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DATA_LIVE_CONNECTIONS,
+    DOMAIN,
+    LIVE_DEFAULT_INTERVAL,
+    LIVE_FIELDS,
+    LIVE_MAX_INTERVAL,
+    LIVE_MAX_SUBSCRIPTIONS,
+    LIVE_MIN_INTERVAL,
+)
+from .services import async_get_coordinator
+
+if TYPE_CHECKING:
+    from .live import LiveDelta
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ember_mug/subscribe",
+        vol.Required(ATTR_DEVICE_ID): str,
+        vol.Optional("fields", default=list(LIVE_FIELDS)): vol.All(cv.ensure_list, [vol.In(LIVE_FIELDS)]),
+        vol.Optional("interval", default=LIVE_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=LIVE_MIN_INTERVAL, max=LIVE_MAX_INTERVAL),
+        ),
+        vol.Optional("stream", default=False): bool,
+    },
+)
+@callback
+def websocket_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """
+    Send the changes of the device data as they are read or pushed, without going through entity states.
+
+    Each message has the changes as `[field, value, timestamp]` since the previous one, which is sent at most once
+    per `interval`. With `stream`, the device is also polled at a high rate while subscribed.
+    """
+    try:
+        coordinator = async_get_coordinator(hass, msg[ATTR_DEVICE_ID])
+    except ServiceValidationError as e:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(e))
+        return
+    # Live subscriptions of each connection, so one client can't flood the event loop
+    live_connections: dict[int, int] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_LIVE_CONNECTIONS, {})
+    connection_id = id(connection)
+    if live_connections.get(connection_id, 0) >= LIVE_MAX_SUBSCRIPTIONS:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_ALLOWED,
+            f"At most {LIVE_MAX_SUBSCRIPTIONS} live subscriptions are allowed per connection",
+        )
+        return
+    live_connections[connection_id] = live_connections.get(connection_id, 0) + 1
+
+    @callback
+    def send_deltas(deltas: list[LiveDelta]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], {"deltas": deltas}))
+
+    release = coordinator.streams.async_acquire((connection_id, msg["id"])) if msg["stream"] else None
+    connection.send_result(msg["id"])
+    # Starts with the current values
+    remove_subscriber = coordinator.live.async_subscribe(send_deltas, msg["fields"], msg["interval"])
+
+    @callback
+    def unsubscribe() -> None:
+        remove_subscriber()
+        if release is not None:
+            release()
+        if live_connections[connection_id] > 1:
+            live_connections[connection_id] -= 1
+        else:
+            del live_connections[connection_id]
+
+    connection.subscriptions[msg["id"]] = unsubscribe
@@ -0,0 +1 @@
+"""Benchmarks for the Ember Mug integration."""
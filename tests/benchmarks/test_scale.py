@@ -0,0 +1,216 @@
+"""Measure how the integration behaves with many simulated devices, set up through the real setup path."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tracemalloc
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path
+from statistics import mean
+from time import monotonic, perf_counter, process_time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from bleak.backends.device import BLEDevice
+from homeassistant.const import CONF_ADDRESS, CONF_NAME
+from homeassistant.helpers.entity import Entity
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ember_mug.const import CONFIG_VERSION, DOMAIN
+from tests.conftest import inject_ble_device_discovery_info
+from tests.simulator import FaultInjection, SimulatedEmberMug
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.ember_mug.coordinator import MugDataUpdateCoordinator
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = Path(__file__).parents[2]
+RESULTS = ROOT / ".benchmarks" / "scale.json"
+VERSION = json.loads((ROOT / "custom_components" / DOMAIN / "manifest.json").read_text())["version"]
+# Every read and write takes a few milliseconds, like a nearby device
+FAULTS = FaultInjection(latency=0.002, jitter=0.002, connect_latency=0.01)
+# Run the thermal model a minute per second, so values change between polls
+SIMULATION_SPEED = 60
+POLL_CYCLES = 3
+# Let the entity updates of a poll be dispatched before starting the next one
+DISPATCH_WAIT = 0.6
+LAG_PROBE_INTERVAL = 0.01
+
+
+def _create_entries(hass: HomeAssistant, devices: int) -> list[MockConfigEntry]:
+    """Add a config entry and an advertisement for each device."""
+    entries = []
+    for device in range(devices):
+        address = f"AA:BB:CC:DD:{device // 256:02X}:{device % 256:02X}"
+        inject_ble_device_discovery_info(hass, BLEDevice(address, f"Ember Mug {device}", {}))
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Mug {device}",
+            data={CONF_ADDRESS: address, CONF_NAME: f"Mug {device}"},
+            version=CONFIG_VERSION,
+            unique_id=address.replace(":", "").lower(),
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+    return entries
+
+
+@contextmanager
+def _simulated_devices() -> Iterator[list[SimulatedEmberMug]]:
+    """Create a simulated device with its own seed in place of each client."""
+    mugs: list[SimulatedEmberMug] = []
+    seeds = count()
+
+    def create_mug(device: BLEDevice, **kwargs: Any) -> SimulatedEmberMug:
+        mug = SimulatedEmberMug(
+            device,
+            seed=next(seeds),
+            faults=FAULTS,
+            sip_rate=0.5,
+            clock=lambda: monotonic() * SIMULATION_SPEED,
+            **kwargs,
+        )
+        mugs.append(mug)
+        return mug
+
+    with patch("custom_components.ember_mug.EmberMug", create_mug):
+        yield mugs
+
+
+@contextmanager
+def _count_state_writes() -> Iterator[list[int]]:
+    """Count the state writes of all entities."""
+    writes = [0]
+    write_state = Entity._async_write_ha_state
+
+    def counted(entity: Entity) -> None:
+        writes[0] += 1
+        write_state(entity)
+
+    with patch.object(Entity, "_async_write_ha_state", counted):
+        yield writes
+
+
+class LagProbe:
+    """Measure how late the event loop wakes up a task sleeping at a fixed interval."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize without having measured anything."""
+        self.hass = hass
+        self.lags: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        loop = self.hass.loop
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.lags.append(loop.time() - start - LAG_PROBE_INTERVAL)
+
+    def start(self) -> None:
+        """Start measuring in the background."""
+        self._task = self.hass.async_create_background_task(self._run(), "lag probe")
+
+    def stop(self) -> dict[str, float]:
+        """Stop measuring and get the mean and worst lag in milliseconds."""
+        if self._task is not None:
+            self._task.cancel()
+        lags = sorted(self.lags) or [0]
+        return {
+            "mean": round(mean(lags) * 1000, 2),
+            "p99": round(lags[int(len(lags) * 0.99)] * 1000, 2),
+            "max": round(lags[-1] * 1000, 2),
+        }
+
+
+async def _setup_entries(hass: HomeAssistant, entries: list[MockConfigEntry]) -> float:
+    """Set up all the entries at once and wait for them to finish starting up, returning how long it took."""
+    start = perf_counter()
+    assert all(await asyncio.gather(*(hass.config_entries.async_setup(entry.entry_id) for entry in entries)))
+    await hass.async_block_till_done()
+    return perf_counter() - start
+
+
+async def _unload_entries(hass: HomeAssistant, entries: list[MockConfigEntry]) -> float:
+    """Unload all the entries at once, returning how long it took."""
+    start = perf_counter()
+    assert all(await asyncio.gather(*(hass.config_entries.async_unload(entry.entry_id) for entry in entries)))
+    await hass.async_block_till_done()
+    return perf_counter() - start
+
+
+async def _poll_cycles(hass: HomeAssistant, coordinators: list[MugDataUpdateCoordinator]) -> dict[str, float]:
+    """Poll every device with all of its attributes due and measure the CPU time and state writes."""
+    cpu_times: list[float] = []
+    start = perf_counter()
+    with _count_state_writes() as writes:
+        for _ in range(POLL_CYCLES):
+            for coordinator in coordinators:
+                coordinator._planner._last_read.clear()
+            cpu_start = process_time()
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+            cpu_times.append(process_time() - cpu_start)
+            await asyncio.sleep(DISPATCH_WAIT)
+    elapsed = perf_counter() - start
+    return {
+        "cpu_per_cycle": round(mean(cpu_times), 4),
+        "cpu_per_device_poll": round(mean(cpu_times) / len(coordinators), 6),
+        "state_writes": writes[0],
+        "state_writes_per_second": round(writes[0] / elapsed, 1),
+    }
+
+
+def _save_results(devices: int, results: dict[str, Any]) -> None:
+    """Add the results for this number of devices to the results file, so releases can be compared."""
+    RESULTS.parent.mkdir(exist_ok=True)
+    saved = json.loads(RESULTS.read_text()) if RESULTS.exists() else {}
+    if saved.get("version") != VERSION:
+        saved = {"version": VERSION, "devices": {}}
+    saved["devices"][str(devices)] = results
+    RESULTS.write_text(json.dumps(saved, indent=2, sort_keys=True))
+
+
+@pytest.mark.parametrize("devices", [1, 10, 50, 100])
+async def test_scale(hass: HomeAssistant, devices: int) -> None:
+    """Set up, poll and unload many simulated devices, measuring the load on the event loop."""
+    await async_setup_component(hass, DOMAIN, {})
+    entries = _create_entries(hass, devices)
+    with _simulated_devices():
+        probe = LagProbe(hass)
+        probe.start()
+        setup_time = await _setup_entries(hass, entries)
+        entities = len(hass.states.async_all())
+        coordinators = [entry.runtime_data for entry in entries]
+        polls = await _poll_cycles(hass, coordinators)
+        lag = probe.stop()
+        assert all(coordinator.available for coordinator in coordinators)
+        unload_time = await _unload_entries(hass, entries)
+
+        # Measure memory separately, as tracing slows everything down
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        await _setup_entries(hass, entries)
+        memory = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+        await _unload_entries(hass, entries)
+
+    results = {
+        "entities": entities,
+        "setup_time": round(setup_time, 3),
+        "unload_time": round(unload_time, 3),
+        "loop_lag_ms": lag,
+        "memory_per_device": memory // devices,
+        "memory_per_entity": memory // entities,
+        **polls,
+    }
+    print(f"{devices} devices: {json.dumps(results, indent=2)}")
+    _save_results(devices, results)
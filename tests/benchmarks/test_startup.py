@@ -0,0 +1,103 @@
+"""Measure the import time of each module and the time to set up a config entry."""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.ember_mug import PLATFORMS
+from tests.conftest import setup_platform
+
+if TYPE_CHECKING:
+    from unittest.mock import Mock
+
+    from ember_mug import EmberMug
+    from homeassistant.core import HomeAssistant
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = Path(__file__).parents[2]
+RESULTS = ROOT / ".benchmarks"
+PACKAGE = "custom_components.ember_mug"
+MODULES = sorted(path.stem for path in (ROOT / "custom_components" / "ember_mug").glob("*.py"))
+HEAVIEST = 10
+
+# Lines of `python -X importtime` look like: "import time:  self [us] | cumulative | imported package"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def _import_times(module: str) -> tuple[int, dict[str, int]]:
+    """
+    Import the module in a clean interpreter and get the total time and the dependencies of the integration in µs.
+
+    The dependencies are the packages imported directly by a module of the integration, with their cumulative time.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+    total = 0
+    dependencies: dict[str, int] = {}
+    # Nested imports are listed before the module importing them, so keep them until their parent is found
+    children: list[tuple[int, str, int]] = []
+    for line in result.stderr.splitlines():
+        if (match := IMPORT_TIME_LINE.match(line)) is None:
+            continue
+        _, cumulative, indent, package = match.groups()
+        depth = len(indent)
+        if depth == 1:
+            total += int(cumulative)
+        nested = [child for child in children if child[0] > depth]
+        children = [child for child in children if child[0] <= depth]
+        if package.startswith(PACKAGE):
+            dependencies.update(
+                (child, time)
+                for _, child, time in nested
+                if not (child.startswith(PACKAGE) or PACKAGE.startswith(child))
+            )
+        children.append((depth, package, int(cumulative)))
+    return total, dependencies
+
+
+def _write_results(name: str, results: dict) -> None:
+    """Save the results so runs can be compared."""
+    RESULTS.mkdir(exist_ok=True)
+    (RESULTS / f"{name}.json").write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+def test_import_time() -> None:
+    """Measure the import time of each module and list the heaviest dependencies."""
+    results: dict[str, dict] = {}
+    for module in MODULES:
+        name = PACKAGE if module == "__init__" else f"{PACKAGE}.{module}"
+        total, dependencies = _import_times(name)
+        heaviest = sorted(dependencies.items(), key=lambda item: item[1], reverse=True)[:HEAVIEST]
+        results[module] = {"total": total, "heaviest": dict(heaviest)}
+        print(f"{module}: {results[module]['total'] / 1000:.1f}ms")
+        for package, time in heaviest:
+            print(f"    {package}: {time / 1000:.1f}ms")
+    _write_results("import_time", results)
+
+
+async def test_setup_time(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Measure the time to set up a config entry with all the platforms, including the startup stages."""
+    start = perf_counter()
+    entry = await setup_platform(hass, mock_mug, list(PLATFORMS))
+    duration = perf_counter() - start
+
+    coordinator = entry.runtime_data
+    results = {"total": duration, "stages": coordinator.startup_stages}
+    print(f"setup: {duration * 1000:.1f}ms")
+    for stage, timing in coordinator.startup_stages.items():
+        print(f"    {stage}: {timing['duration'] * 1000:.1f}ms ({timing['result']})")
+    _write_results("setup_time", results)
@@ -0,0 +1,146 @@
+"""Benchmark the cost of writing the state of every entity."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from ember_mug.consts import DeviceModel, LiquidState
+from ember_mug.data import BatteryInfo, ModelInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from custom_components.ember_mug import PLATFORMS
+from custom_components.ember_mug.accessors import compile_accessor
+from custom_components.ember_mug.const import DOMAIN
+from tests.conftest import setup_platform
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Any
+    from unittest.mock import Mock
+
+    from ember_mug import EmberMug
+    from homeassistant.core import HomeAssistant
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = 2000
+ROOT = Path(__file__).parents[2]
+RESULTS = ROOT / ".benchmarks" / "state_writes.json"
+# Alternate between states far enough apart to get past any deadband
+SENSOR_STATES = [
+    (55.0, 30, LiquidState.HEATING, 80.0),
+    (58.0, 20, LiquidState.TARGET_TEMPERATURE, 70.0),
+]
+
+
+def _split_getattr(data: Any, device_attr: str) -> Any:
+    """Look up the attribute the way it was done before accessors were compiled."""
+    value = data
+    for attr in device_attr.split("."):
+        try:
+            value = getattr(value, attr)
+        except AttributeError:
+            return None
+    return value
+
+
+def _per_call(func: Any, *args: Any) -> float:
+    """Get the average time of a call in microseconds."""
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        func(*args)
+    return (perf_counter() - start) / ROUNDS * 1_000_000
+
+
+def test_accessor_lookup(mock_mug: EmberMug | Mock) -> None:
+    """Compare compiled accessors with splitting the path on every lookup."""
+    mock_mug.data.battery = BatteryInfo(50, True)
+    for device_attr in ("current_temp", "battery.percent", "battery.on_charging_base"):
+        accessor = compile_accessor(device_attr)
+        legacy = _per_call(_split_getattr, mock_mug.data, device_attr)
+        compiled = _per_call(accessor, mock_mug.data)
+        print(f"{device_attr}: split {legacy:.3f}µs, compiled {compiled:.3f}µs")
+        assert accessor(mock_mug.data) == _split_getattr(mock_mug.data, device_attr)
+
+
+async def test_state_write_cost(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Measure the time to write the state of every entity, grouped by platform."""
+    mock_mug.data.model_info = ModelInfo(DeviceModel.MUG_2_10_OZ)
+    mock_mug.data.liquid_state = LiquidState.HEATING
+    mock_mug.data.battery = BatteryInfo(50, True)
+    await setup_platform(hass, mock_mug, list(PLATFORMS))
+
+    costs: dict[str, list[float]] = defaultdict(list)
+    for platform in async_get_platforms(hass, DOMAIN):
+        for entity in platform.entities.values():
+            costs[platform.domain].append(_per_call(entity.async_write_ha_state))
+
+    assert costs
+    for domain, per_entity in sorted(costs.items()):
+        total = sum(per_entity)
+        print(f"{domain}: {len(per_entity)} entities, {total / len(per_entity):.1f}µs per write")
+
+
+def _revision() -> str:
+    """Get the revision being measured, so runs before and after a change can be compared."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+        capture_output=True,
+        check=False,
+        cwd=ROOT,
+        text=True,
+    )
+    return result.stdout.strip() or "unknown"
+
+
+@contextmanager
+def _time_state_writes() -> Iterator[list[float]]:
+    """Count the state writes of all entities, with the time spent in them."""
+    writes = [0, 0.0]
+    write_state = Entity._async_write_ha_state
+
+    def timed(entity: Entity) -> None:
+        start = perf_counter()
+        write_state(entity)
+        writes[0] += 1
+        writes[1] += perf_counter() - start
+
+    with patch.object(Entity, "_async_write_ha_state", timed):
+        yield writes
+
+
+async def test_sensor_state_writes(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Update all the sensors with changing values and measure the state writes per second."""
+    mock_mug.data.model_info = ModelInfo(DeviceModel.MUG_2_10_OZ)
+    entry = await setup_platform(hass, mock_mug, "sensor")
+    coordinator = entry.runtime_data
+    data = mock_mug.data
+
+    with _time_state_writes() as writes:
+        start = perf_counter()
+        for update in range(ROUNDS):
+            data.current_temp, data.liquid_level, data.liquid_state, percent = SENSOR_STATES[update % 2]
+            data.battery = BatteryInfo(percent, on_charging_base=True)
+            coordinator.async_update_listeners()
+        elapsed = perf_counter() - start
+
+    results = {
+        "state_writes": writes[0],
+        "state_writes_per_second": round(writes[0] / elapsed),
+        "update_and_write_us": round(elapsed / writes[0] * 1_000_000, 1),
+        "write_us": round(writes[1] / writes[0] * 1_000_000, 1),
+    }
+    print(f"{_revision()}: {json.dumps(results, indent=2)}")
+    RESULTS.parent.mkdir(exist_ok=True)
+    saved = json.loads(RESULTS.read_text()) if RESULTS.exists() else {}
+    saved[_revision()] = results
+    RESULTS.write_text(json.dumps(saved, indent=2, sort_keys=True))
@@ -1,7 +1,8 @@
 """Configure pytest."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -16,6 +17,7 @@ from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ember_mug import CONFIG_VERSION, DOMAIN, MugDataUpdateCoordinator
+from custom_components.ember_mug.const import ATTRIBUTE_MAX_AGE
 from tests import (
     DEFAULT_CONFIG_DATA,
     MUG_SERVICE_INFO,
@@ -63,9 +65,17 @@ def mock_mug():
     mock_mug.update_initial = AsyncMock(return_value=[])
     mock_mug.update_all = AsyncMock(return_value=[])
     mock_mug.update_queued_attributes = AsyncMock(return_value=[])
+    # Reading an attribute returns the current value
+    for attr in ATTRIBUTE_MAX_AGE:
+        setattr(mock_mug, f"get_{attr}", AsyncMock(side_effect=partial(_get_mug_attr, mock_mug, attr)))
     return mock_mug
 
 
+def _get_mug_attr(mug: EmberMug, attr: str) -> Any:
+    """Get the current value of the attribute from the mug data."""
+    return getattr(mug.data, attr)
+
+
 def inject_ble_device_discovery_info(hass: HomeAssistant, device: BLEDevice):
     """Inject the device advertisement for Home Assistant."""
     service_info = {**MUG_SERVICE_INFO.as_dict()}
@@ -109,10 +119,14 @@ async def setup_platform(
         _m: EmberMug,
         base_unique_id: str,
         device_name: str,
+        **kwargs: Any,
     ) -> MugDataUpdateCoordinator:
-        coordinator = MugDataUpdateCoordinator(h, Mock(), mock_mug, base_unique_id, device_name)
+        coordinator = MugDataUpdateCoordinator(h, Mock(), mock_mug, base_unique_id, device_name, **kwargs)
         coordinator.persistent_data = {}
-        coordinator._store = AsyncMock(async_load=AsyncMock(return_value=coordinator.persistent_data))
+        coordinator._store = Mock(
+            async_load=AsyncMock(return_value=coordinator.persistent_data),
+            async_delay_save=Mock(),
+        )
         return coordinator
 
     with (
@@ -124,6 +138,6 @@ async def setup_platform(
 
     # Check mug tried to update
     mock_mug.update_initial.assert_called_once()
-    mock_mug.update_all.assert_called_once()
+    mock_mug.get_current_temp.assert_called()
 
     return config_entry
@@ -0,0 +1,280 @@
+"""
+A simulated Ember device to use in place of the `EmberMug` client without a radio.
+
+Everything above the GATT reads and writes is the real client, so the values go through the same parsing.
+The device runs a simple thermal model (heating, cooling, drinking and the battery) and sends notifications
+when something changes while connected. Latency and failures can be injected, and a seeded random number
+generator keeps runs reproducible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from bleak import BleakError
+from ember_mug import EmberMug
+from ember_mug.consts import DeviceType, LiquidState, MugCharacteristic, PushEvent, VolumeLevel
+from ember_mug.data import ModelInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from bleak.backends.device import BLEDevice
+
+# The device heats quickly, but loses heat to the room slowly
+HEAT_RATE = 0.05  # °C per second while heating
+COOLING_FACTOR = 0.0008  # Fraction of the difference with the room lost per second
+# Battery in % per second
+BATTERY_DRAIN_HEATING = 0.01
+BATTERY_DRAIN_IDLE = 0.001
+BATTERY_CHARGE = 0.05
+# Full is 30 (100 for the Travel Mug), each sip drinks this much
+SIP_LEVEL = 2
+# Within this many °C of the target, the device is at the target temperature
+TARGET_MARGIN = 0.5
+# Only notify if the temperature moved by at least this much
+TEMP_NOTIFY_STEP = 0.5
+
+
+@dataclass
+class FaultInjection:
+    """Latency and chance of failure of each operation."""
+
+    # Seconds each read or write takes, plus up to `jitter` more
+    latency: float = 0
+    jitter: float = 0
+    connect_latency: float = 0
+    # Chance (0-1) of an operation raising a BleakError
+    read_failure_rate: float = 0
+    write_failure_rate: float = 0
+    connect_failure_rate: float = 0
+    # Chance (0-1) of an operation timing out
+    timeout_rate: float = 0
+
+
+@dataclass
+class ThermalState:
+    """The physical state of the simulated device, in Celsius."""
+
+    current_temp: float = 22.0
+    target_temp: float = 55.0
+    ambient_temp: float = 22.0
+    liquid_level: int = 30
+    battery: float = 80.0
+    on_charging_base: bool = True
+    liquid_state: LiquidState = LiquidState.STANDBY
+    battery_voltage: int = 1
+
+
+class SimulatedEmberMug(EmberMug):
+    """
+    An `EmberMug` that talks to a simulated device instead of a real one.
+
+    The model only moves forward with `advance`, or on every operation using the time from `clock` if one is given.
+    """
+
+    def __init__(
+        self,
+        ble_device: BLEDevice,
+        model_info: ModelInfo | None = None,
+        *,
+        seed: int = 0,
+        faults: FaultInjection | None = None,
+        thermal: ThermalState | None = None,
+        sip_rate: float = 0,
+        clock: Callable[[], float] | None = None,
+        **kwargs: bool | None,
+    ) -> None:
+        """Initialize the simulated device, drinking `sip_rate` sips per minute on average."""
+        super().__init__(ble_device, model_info or ModelInfo(), **kwargs)
+        self.rng = random.Random(seed)  # noqa: S311
+        self.faults = faults or FaultInjection()
+        self.thermal = thermal or ThermalState()
+        self.sip_rate = sip_rate
+        self.clock = clock
+        self._last_tick = clock() if clock else 0.0
+        self.connected = False
+        self.elapsed = 0.0
+        self.reads = 0
+        self.writes = 0
+        self.connects = 0
+        self.notifications_sent = 0
+        self._notified_temp = self.thermal.current_temp
+        # Values the device stores as is
+        self.stored: dict[MugCharacteristic, bytes] = {
+            MugCharacteristic.MUG_NAME: b"Ember Mug",
+            MugCharacteristic.TEMPERATURE_UNIT: bytes([0]),
+            MugCharacteristic.DATE_TIME_AND_ZONE: (1_700_000_000).to_bytes(4, "big") + bytes([0]),
+            MugCharacteristic.VOLUME: bytes([VolumeLevel.MEDIUM.state]),
+            MugCharacteristic.FIRMWARE: bytes([0x5C, 0x01, 0x52, 0x00, 0x01, 0x00]),
+            MugCharacteristic.MUG_ID: b"simmug\x00SIM-000001",
+            MugCharacteristic.DSK: b"simulated-dsk",
+            MugCharacteristic.UDSK: bytes(20),
+            MugCharacteristic.LED: bytes([255, 255, 255, 255]),
+        }
+
+    @property
+    def full_level(self) -> int:
+        """The liquid level when full."""
+        return 100 if self.data.model_info.device_type == DeviceType.TRAVEL_MUG else 30
+
+    def advance(self, seconds: float) -> None:
+        """Run the thermal model for this many seconds, in steps of at most a second."""
+        while seconds > 0:
+            step = min(seconds, 1)
+            self._step(step)
+            seconds -= step
+            self.elapsed += step
+
+    def _tick(self) -> None:
+        """Catch up with the clock, if there is one."""
+        if self.clock is None:
+            return
+        now = self.clock()
+        self.advance(now - self._last_tick)
+        self._last_tick = now
+
+    def _step(self, seconds: float) -> None:
+        """Move the thermal model forward and notify about anything that changed."""
+        state = self.thermal
+        old_state, old_level = state.liquid_state, state.liquid_level
+        heating = self._step_temperature(seconds)
+
+        if state.on_charging_base:
+            state.battery = min(state.battery + BATTERY_CHARGE * seconds, 100)
+        else:
+            drain = BATTERY_DRAIN_HEATING if heating else BATTERY_DRAIN_IDLE
+            state.battery = max(state.battery - drain * seconds, 0)
+
+        if state.liquid_level and self.sip_rate and self.rng.random() < self.sip_rate / 60 * seconds:
+            state.liquid_level = max(state.liquid_level - SIP_LEVEL, 0)
+
+        if state.liquid_state != old_state:
+            self._notify(PushEvent.LIQUID_STATE_CHANGED)
+        if state.liquid_level != old_level:
+            self._notify(PushEvent.LIQUID_LEVEL_CHANGED)
+        if abs(state.current_temp - self._notified_temp) >= TEMP_NOTIFY_STEP:
+            self._notified_temp = state.current_temp
+            self._notify(PushEvent.DRINK_TEMPERATURE_CHANGED)
+
+    def _step_temperature(self, seconds: float) -> bool:
+        """Heat or cool the liquid and update the liquid state, returning whether the device is heating."""
+        state = self.thermal
+        heating = False
+        if state.liquid_level == 0:
+            state.liquid_state = LiquidState.EMPTY
+        elif state.target_temp and state.battery > 0 and state.current_temp < state.target_temp - TARGET_MARGIN:
+            state.current_temp = min(state.current_temp + HEAT_RATE * seconds, state.target_temp)
+            state.liquid_state = LiquidState.HEATING
+            heating = True
+        elif state.target_temp and state.current_temp > state.target_temp + TARGET_MARGIN:
+            state.liquid_state = LiquidState.COOLING
+        elif state.target_temp and state.battery > 0:
+            # Holding at the target temperature
+            state.current_temp = state.target_temp
+            state.liquid_state = LiquidState.TARGET_TEMPERATURE
+            heating = True
+        elif state.current_temp > state.ambient_temp + 10:
+            state.liquid_state = LiquidState.WARM_NO_TEMP_CONTROL
+        else:
+            state.liquid_state = LiquidState.COLD_NO_TEMP_CONTROL
+        if not heating:
+            state.current_temp -= (state.current_temp - state.ambient_temp) * COOLING_FACTOR * seconds
+        return heating
+
+    def fill(self, temp: float) -> None:
+        """Pour a drink of the given temperature into the device."""
+        self.thermal.liquid_level = self.full_level
+        self.thermal.current_temp = temp
+        self._notify(PushEvent.LIQUID_LEVEL_CHANGED)
+
+    def set_charging(self, on_charging_base: bool) -> None:
+        """Put the device on or take it off the charging base."""
+        self.thermal.on_charging_base = on_charging_base
+        self._notify(PushEvent.CHARGER_CONNECTED if on_charging_base else PushEvent.CHARGER_DISCONNECTED)
+
+    def _notify(self, event: PushEvent) -> None:
+        """Send a notification to the client, if it is connected."""
+        if not self.connected:
+            return
+        self.notifications_sent += 1
+        self._notify_callback(SimpleNamespace(uuid=MugCharacteristic.PUSH_EVENT.uuid), bytearray([event]))
+
+    async def _delay(self, latency: float) -> None:
+        """Wait for an operation to go through and maybe fail it."""
+        if latency or self.faults.jitter:
+            await asyncio.sleep(latency + self.rng.random() * self.faults.jitter)
+        if self.faults.timeout_rate and self.rng.random() < self.faults.timeout_rate:
+            raise TimeoutError("Simulated timeout")
+
+    def _maybe_fail(self, rate: float, operation: str) -> None:
+        """Raise a BleakError with the given chance."""
+        if rate and self.rng.random() < rate:
+            raise BleakError(f"Simulated {operation} failure")
+
+    async def _ensure_connection(self) -> None:
+        """Connect to the simulated device."""
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            await self._delay(self.faults.connect_latency)
+            self._maybe_fail(self.faults.connect_failure_rate, "connect")
+            self.connects += 1
+            self.connected = True
+            self._client = SimpleNamespace(is_connected=True)  # type: ignore[assignment]
+
+    async def pair(self) -> None:
+        """Connect to the simulated device, which doesn't need pairing."""
+        with contextlib.suppress(BleakError):
+            await self._ensure_connection()
+
+    async def disconnect(self, expected: bool = True) -> None:
+        """Disconnect from the simulated device."""
+        self.connected = False
+        self._client = None  # type: ignore[assignment]
+
+    async def _read(self, characteristic: MugCharacteristic) -> bytearray:
+        """Read the value of the characteristic from the simulated device."""
+        async with self._operation_lock:
+            await self._ensure_connection()
+            await self._delay(self.faults.latency)
+            self._maybe_fail(self.faults.read_failure_rate, "read")
+            self._tick()
+            self.reads += 1
+            return bytearray(self._encode(characteristic))
+
+    async def _write(self, characteristic: MugCharacteristic, data: bytearray) -> None:
+        """Write the value of the characteristic to the simulated device."""
+        async with self._operation_lock:
+            await self._ensure_connection()
+            await self._delay(self.faults.latency)
+            self._maybe_fail(self.faults.write_failure_rate, "write")
+            self._tick()
+            self.writes += 1
+            if characteristic == MugCharacteristic.TARGET_TEMPERATURE:
+                self.thermal.target_temp = int.from_bytes(data, "little") / 100
+                self._notify(PushEvent.TARGET_TEMPERATURE_CHANGED)
+            else:
+                self.stored[characteristic] = bytes(data)
+
+    def _encode(self, characteristic: MugCharacteristic) -> bytes:
+        """Encode the current state of the characteristic the way the device does."""
+        state = self.thermal
+        live = {
+            MugCharacteristic.CURRENT_TEMPERATURE: round(state.current_temp * 100).to_bytes(2, "little"),
+            MugCharacteristic.TARGET_TEMPERATURE: round(state.target_temp * 100).to_bytes(2, "little"),
+            MugCharacteristic.LIQUID_LEVEL: bytes([state.liquid_level]),
+            MugCharacteristic.LIQUID_STATE: bytes([state.liquid_state]),
+            MugCharacteristic.BATTERY: bytes([round(state.battery), int(state.on_charging_base)]),
+            MugCharacteristic.CONTROL_REGISTER_DATA: bytes([state.battery_voltage]),
+        }
+        if (value := live.get(characteristic, self.stored.get(characteristic))) is None:
+            raise BleakError(f"Characteristic {characteristic} was not found")
+        return value
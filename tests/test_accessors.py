@@ -0,0 +1,24 @@
+"""Test the compiled device attribute accessors."""
+
+from __future__ import annotations
+
+from ember_mug.data import BatteryInfo, ModelInfo, MugData
+
+from custom_components.ember_mug.accessors import compile_accessor
+
+
+def test_compile_accessor() -> None:
+    """Test dotted paths are resolved and missing parts return None."""
+    data = MugData(ModelInfo())
+    data.battery = BatteryInfo(45.5, True)
+    data.current_temp = 52.5
+    assert compile_accessor("current_temp")(data) == 52.5
+    assert compile_accessor("battery.percent")(data) == 45.5
+    assert compile_accessor("battery.on_charging_base")(data) is True
+    assert compile_accessor("battery.missing")(data) is None
+    assert compile_accessor("missing.percent")(data) is None
+
+    data.battery = None
+    assert compile_accessor("battery.percent")(data) is None
+    # Compiled once and shared
+    assert compile_accessor("battery.percent") is compile_accessor("battery.percent")
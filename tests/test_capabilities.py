@@ -0,0 +1,29 @@
+"""Test the platforms set up for each device model."""
+
+from __future__ import annotations
+
+import pytest
+from ember_mug.consts import DeviceModel
+from homeassistant.const import Platform
+
+from custom_components.ember_mug import PLATFORMS
+from custom_components.ember_mug.capabilities import get_platforms, get_unsupported_platforms
+
+
+@pytest.mark.parametrize(
+    ("model", "unsupported"),
+    [
+        (DeviceModel.MUG_2_10_OZ, set()),
+        (DeviceModel.TRAVEL_MUG_12_OZ, {Platform.LIGHT}),
+        (DeviceModel.CUP_6_OZ, {Platform.TEXT}),
+        (DeviceModel.TUMBLER_16_OZ, {Platform.TEXT}),
+        (DeviceModel.UNKNOWN_DEVICE, set()),
+        (None, set()),
+    ],
+)
+def test_get_platforms(model: DeviceModel | None, unsupported: set[Platform]) -> None:
+    """Test only platforms with entities for the model are set up."""
+    assert get_unsupported_platforms(model) == unsupported
+    assert get_platforms(PLATFORMS, model) == [platform for platform in PLATFORMS if platform not in unsupported]
+    # Only worked out once per model
+    assert get_unsupported_platforms(model) is get_unsupported_platforms(model)
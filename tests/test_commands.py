@@ -0,0 +1,59 @@
+"""Test the debounced write command queue."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+import pytest
+from bleak import BleakError
+
+from custom_components.ember_mug.commands import CommandQueue
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+async def test_latest_write_wins(hass: HomeAssistant) -> None:
+    """Test writes to the same attribute are merged and all pending writes are sent together."""
+    send = AsyncMock()
+    set_target_temp, set_led_colour = AsyncMock(), AsyncMock()
+    queue = CommandQueue(hass, send, debounce=0.01, max_delay=1)
+
+    writes = [asyncio.create_task(queue.async_write("target_temp", set_target_temp, temp)) for temp in (50, 51, 52)]
+    writes.append(asyncio.create_task(queue.async_write("led_colour", set_led_colour, (1, 2, 3, 255))))
+    await asyncio.sleep(0)
+    assert queue.pending_value("target_temp") == 52
+    assert queue.pending_value("name") is None
+
+    await asyncio.gather(*writes)
+    send.assert_awaited_once_with([(set_target_temp, 52), (set_led_colour, (1, 2, 3, 255))])
+    assert queue.pending_value("target_temp") is None
+    assert (queue.writes_queued, queue.writes_sent, queue.writes_superseded) == (4, 2, 2)
+
+
+async def test_write_errors(hass: HomeAssistant) -> None:
+    """Test everyone waiting on a batch gets its error and later batches are unaffected."""
+    send = AsyncMock(side_effect=[BleakError("Failed"), None])
+    set_target_temp = AsyncMock()
+    queue = CommandQueue(hass, send, debounce=0.01, max_delay=1)
+
+    writes = [asyncio.create_task(queue.async_write("target_temp", set_target_temp, temp)) for temp in (50, 51)]
+    for write in writes:
+        with pytest.raises(BleakError):
+            await write
+    await queue.async_write("target_temp", set_target_temp, 52)
+    assert send.await_count == 2
+
+
+async def test_cancel(hass: HomeAssistant) -> None:
+    """Test pending writes are dropped when cancelled."""
+    send = AsyncMock()
+    queue = CommandQueue(hass, send, debounce=1, max_delay=1)
+    write = asyncio.create_task(queue.async_write("target_temp", AsyncMock(), 50))
+    await asyncio.sleep(0)
+    queue.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await write
+    send.assert_not_awaited()
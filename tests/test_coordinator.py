@@ -0,0 +1,505 @@
+"""Test the Mug data update coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bleak import BleakError
+from ember_mug.consts import DeviceModel, LiquidState, PushEvent
+from ember_mug.data import BatteryInfo, Change, ModelInfo, MugFirmwareInfo
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.helpers.storage import Store
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ember_mug import MugDataUpdateCoordinator
+from custom_components.ember_mug.const import (
+    DOMAIN,
+    PUSH_HEALTHY_WINDOW,
+    PUSH_SAFETY_INTERVAL,
+    STORAGE_SAVE_DELAY,
+    UPDATE_INTERVAL,
+    UPDATE_INTERVAL_ACTIVE,
+    UPDATE_INTERVAL_IDLE,
+    UPDATE_INTERVAL_MAX,
+)
+from custom_components.ember_mug.snapshot import dump_snapshot, dump_static_info
+from tests import MUG_SERVICE_INFO
+
+if TYPE_CHECKING:
+    from datetime import timedelta
+
+    from ember_mug import EmberMug
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.mark.parametrize(
+    ("liquid_state", "on_charging_base", "expected_interval"),
+    [
+        (LiquidState.HEATING, True, UPDATE_INTERVAL_ACTIVE),
+        (LiquidState.COOLING, False, UPDATE_INTERVAL_ACTIVE),
+        (LiquidState.FILLING, True, UPDATE_INTERVAL_ACTIVE),
+        (LiquidState.TARGET_TEMPERATURE, True, UPDATE_INTERVAL),
+        (LiquidState.EMPTY, True, UPDATE_INTERVAL_IDLE),
+        (LiquidState.STANDBY, True, UPDATE_INTERVAL_IDLE),
+        (LiquidState.EMPTY, False, UPDATE_INTERVAL),
+        (None, None, UPDATE_INTERVAL),
+    ],
+)
+def test_update_interval_from_state(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+    liquid_state: LiquidState | None,
+    on_charging_base: bool | None,
+    expected_interval: timedelta,
+) -> None:
+    """Test the poll interval follows the state of the mug."""
+    mock_mug.data.liquid_state = liquid_state
+    if on_charging_base is not None:
+        mock_mug.data.battery = BatteryInfo(50, on_charging_base)
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    assert coordinator._next_update_interval() == expected_interval
+
+
+def test_update_interval_after_write(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test polling speeds up after the user changed something."""
+    mock_mug.data.liquid_state = LiquidState.EMPTY
+    mock_mug.data.battery = BatteryInfo(50, True)
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    assert coordinator._next_update_interval() == UPDATE_INTERVAL_IDLE
+    coordinator.refresh_from_mug()
+    assert coordinator.update_interval == UPDATE_INTERVAL_ACTIVE
+    assert coordinator._next_update_interval() == UPDATE_INTERVAL_ACTIVE
+
+
+async def test_update_interval_backoff(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test polling backs off after repeated failures and recovers after a success."""
+    mock_mug.data.liquid_state = LiquidState.HEATING
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    mock_mug._ensure_connection.side_effect = BleakError()
+
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == UPDATE_INTERVAL * 2
+    await coordinator._async_update_data()
+    assert coordinator.update_interval == UPDATE_INTERVAL * 4
+    for _ in range(5):
+        await coordinator._async_update_data()
+    assert coordinator.update_interval == UPDATE_INTERVAL_MAX
+
+    mock_mug._ensure_connection.side_effect = None
+    await coordinator._async_update_data()
+    assert coordinator.available is True
+    assert coordinator.update_interval == UPDATE_INTERVAL_ACTIVE
+
+
+async def test_update_reads_due_attributes(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test only attributes that are past their maximum age are read."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    attrs = mock_mug.data.model_info.device_attributes
+    coordinator._planner.mark_read(attrs, monotonic() - 40)
+    mock_mug._queued_updates.add("liquid_level")
+    mock_mug.update_queued_attributes.return_value = [Change("liquid_level", 1, 2)]
+
+    await coordinator._async_update_data()
+    mock_mug.get_current_temp.assert_called_once()
+    mock_mug.get_liquid_state.assert_called_once()
+    # Just read from the queue
+    mock_mug.get_liquid_level.assert_not_called()
+    mock_mug.get_battery.assert_not_called()
+    mock_mug.get_firmware.assert_not_called()
+    assert coordinator._planner.reads_planned == 2
+    assert coordinator._planner.reads_skipped == len(attrs) - 2
+
+
+async def test_push_first_updates(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test polling is suspended while notifications are live and resumes when they stop."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    attrs = mock_mug.data.model_info.device_attributes
+    coordinator._planner.mark_read(attrs, monotonic() - 120)
+    mock_mug._latest_events[PushEvent.DRINK_TEMPERATURE_CHANGED] = time()
+
+    await coordinator._async_update_data()
+    assert coordinator.push_live is True
+    # Nothing is due, so the device isn't even connected to
+    mock_mug._ensure_connection.assert_not_called()
+    mock_mug.update_queued_attributes.assert_not_called()
+    mock_mug.get_current_temp.assert_not_called()
+    mock_mug.get_battery.assert_not_called()
+
+    # Safety sweep
+    coordinator._planner.mark_read(attrs, monotonic() - PUSH_SAFETY_INTERVAL.total_seconds())
+    await coordinator._async_update_data()
+    mock_mug.get_current_temp.assert_called_once()
+    mock_mug.get_battery.assert_called_once()
+
+    # Notifications went quiet, so poll again
+    mock_mug.get_current_temp.reset_mock()
+    coordinator._planner.mark_read(attrs, monotonic() - 120)
+    stale = time() + PUSH_HEALTHY_WINDOW.total_seconds()
+    with patch("custom_components.ember_mug.coordinator.time", return_value=stale):
+        await coordinator._async_update_data()
+    assert coordinator.push_live is False
+    mock_mug.get_current_temp.assert_called_once()
+
+
+async def test_push_first_disabled(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test notifications are ignored for polling if push first is disabled."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    coordinator.push_first = False
+    coordinator._planner.mark_read(mock_mug.data.model_info.device_attributes, monotonic() - 120)
+    mock_mug._latest_events[PushEvent.DRINK_TEMPERATURE_CHANGED] = time()
+    await coordinator._async_update_data()
+    assert coordinator.push_live is False
+    mock_mug.get_current_temp.assert_called_once()
+
+
+async def test_attribute_listeners(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test only listeners of attributes that changed are updated."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    coordinator.dispatch_window = 0
+    coordinator.available = True
+    coordinator._planner.mark_read(mock_mug.data.model_info.device_attributes, monotonic() - 10)
+    temp_listener, state_listener, general_listener = Mock(), Mock(), Mock()
+    coordinator.async_add_attribute_listener({"current_temp", "liquid_state"}, temp_listener)
+    remove_state_listener = coordinator.async_add_attribute_listener({"liquid_state"}, state_listener)
+    coordinator.async_add_listener(general_listener)
+
+    # Nothing changed
+    await coordinator._async_update_data()
+    temp_listener.assert_not_called()
+    state_listener.assert_not_called()
+    general_listener.assert_not_called()
+
+    # Both changed, but each listener is only called once
+    mock_mug.get_current_temp.side_effect = [55.5]
+    mock_mug.get_liquid_state.side_effect = [LiquidState.HEATING]
+    coordinator._planner.mark_read(mock_mug.data.model_info.device_attributes, monotonic() - 10)
+    await coordinator._async_update_data()
+    temp_listener.assert_called_once()
+    state_listener.assert_called_once()
+    general_listener.assert_not_called()
+
+    # Availability changes update everything
+    remove_state_listener()
+    coordinator.available = False
+    await coordinator._async_update_data()
+    general_listener.assert_called_once()
+    assert coordinator._attribute_listeners == {"current_temp": [temp_listener], "liquid_state": [temp_listener]}
+
+
+async def test_dispatch_coalesced(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test updates from polls, notifications and advertisements within the window are merged."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    coordinator.dispatch_window = 0.01
+    temp_listener, level_listener, general_listener = Mock(), Mock(), Mock()
+    coordinator.async_add_attribute_listener({"current_temp"}, temp_listener)
+    coordinator.async_add_attribute_listener({"liquid_level"}, level_listener)
+    coordinator.async_add_listener(general_listener)
+
+    coordinator.async_schedule_dispatch(["current_temp"])
+    coordinator.async_schedule_dispatch(["current_temp"])
+    coordinator.async_schedule_dispatch([])
+    temp_listener.assert_not_called()
+    await asyncio.sleep(0.05)
+    temp_listener.assert_called_once()
+    level_listener.assert_not_called()
+    general_listener.assert_not_called()
+    assert coordinator.dispatches == 1
+    assert coordinator.dispatches_saved == 1
+
+    # A notification arriving during a poll is left to the poll
+    coordinator._polling = True
+    coordinator._async_handle_callback(mock_mug.data)
+    assert coordinator._dispatch_handle is None
+    coordinator._polling = False
+
+    # A notification and an advertisement update everything once
+    coordinator._async_handle_callback(mock_mug.data)
+    coordinator.async_schedule_dispatch(["liquid_level"])
+    await asyncio.sleep(0.05)
+    assert general_listener.call_count == 1
+    assert temp_listener.call_count == 2
+    level_listener.assert_called_once()
+    assert coordinator.dispatches == 2
+
+    # Nothing is left pending after shutting down
+    coordinator.async_schedule_dispatch(["current_temp"])
+    await coordinator.async_shutdown()
+    assert coordinator._dispatch_handle is None
+
+
+def _service_info(**changes: Any) -> BluetoothServiceInfoBleak:
+    """Copy the test advertisement with some changes."""
+    return BluetoothServiceInfoBleak(**(MUG_SERVICE_INFO.as_dict() | changes))
+
+
+async def test_advertisements_deduplicated(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test repeated advertisements are skipped and only one stale connection sweep runs at a time."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    coordinator.dispatch_window = 0
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+    release = asyncio.Event()
+
+    async def close_stale_connections(*args: object) -> None:
+        await release.wait()
+
+    with patch(
+        "custom_components.ember_mug.coordinator.close_stale_connections",
+        side_effect=close_stale_connections,
+    ) as mock_close_stale:
+        coordinator.handle_bluetooth_event(MUG_SERVICE_INFO, Mock())
+        # Only the signal strength changed
+        coordinator.handle_bluetooth_event(_service_info(rssi=-80), Mock())
+        assert coordinator.available is True
+        assert listener.call_count == 1
+        assert (coordinator.adverts_processed, coordinator.adverts_skipped) == (1, 1)
+
+        new_payload = _service_info(manufacturer_data={**MUG_SERVICE_INFO.manufacturer_data, 1: b"\x01"})
+        coordinator.handle_bluetooth_event(new_payload, Mock())
+        assert listener.call_count == 2
+        assert coordinator.adverts_processed == 2
+        assert coordinator.adverts_coalesced == 1
+        mock_close_stale.assert_called_once()
+
+        # Going unavailable processes the next one even if it is the same
+        coordinator.handle_unavailable(new_payload)
+        release.set()
+        await hass.async_block_till_done()
+        coordinator.handle_bluetooth_event(new_payload, Mock())
+        assert coordinator.adverts_processed == 3
+        assert mock_close_stale.call_count == 2
+
+        await coordinator.async_shutdown()
+        assert coordinator._stale_task is None
+
+
+async def test_storage_per_device(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test each device has its own storage, migrated from the shared file, and saves are delayed."""
+    hass_storage[DOMAIN] = {"version": 1, "minor_version": 1, "key": DOMAIN, "data": {"target_temp_bkp": 55}}
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "mug-1", "name")
+    coordinator.persistent_data = await coordinator._async_load_storage()
+    assert coordinator.persistent_data == {"target_temp_bkp": 55}
+    assert hass_storage[f"{DOMAIN}.mug-1"]["data"] == {"target_temp_bkp": 55}
+    assert DOMAIN not in hass_storage
+
+    # Devices loaded later start empty instead of inheriting the shared data
+    other = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "mug-2", "name")
+    await other.async_load_storage()
+    assert other.persistent_data == {}
+    other.write_to_storage(50)
+
+    # Quickly toggling only saves the last value
+    coordinator.write_to_storage(45)
+    coordinator.write_to_storage(60)
+    assert hass_storage[f"{DOMAIN}.mug-1"]["data"] == {"target_temp_bkp": 55}
+    freezer.tick(STORAGE_SAVE_DELAY + 1)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[f"{DOMAIN}.mug-1"]["data"]["target_temp_bkp"] == 60
+    assert hass_storage[f"{DOMAIN}.mug-2"]["data"]["target_temp_bkp"] == 50
+
+
+async def test_storage_migrated_once(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test the shared file is only moved to one device when they are set up together."""
+    hass_storage[DOMAIN] = {"version": 1, "minor_version": 1, "key": DOMAIN, "data": {"target_temp_bkp": 55}}
+    coordinators = [MugDataUpdateCoordinator(hass, Mock(), mock_mug, f"mug-{i}", "name") for i in range(1, 3)]
+    load = Store._async_load
+
+    async def slow_load(store: Store) -> Any:
+        data = await load(store)
+        # Reading from disk gives the other entry a chance to run
+        await asyncio.sleep(0)
+        return data
+
+    with patch.object(Store, "_async_load", slow_load):
+        await asyncio.gather(*(coordinator.async_load_storage() for coordinator in coordinators))
+    assert [coordinator.persistent_data for coordinator in coordinators] == [{"target_temp_bkp": 55}, {}]
+    assert hass_storage[f"{DOMAIN}.mug-1"]["data"] == {"target_temp_bkp": 55}
+    assert f"{DOMAIN}.mug-2" not in hass_storage
+    assert DOMAIN not in hass_storage
+
+
+async def test_restore_snapshot(hass: HomeAssistant, hass_storage: dict[str, Any], mock_mug: EmberMug | Mock) -> None:
+    """Test the last known state is shown until the device is read."""
+    mock_mug.data.name = "Saved"
+    mock_mug.data.target_temp = 55
+    snapshot = dump_snapshot(mock_mug.data)
+    hass_storage[f"{DOMAIN}.mug-1"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.mug-1",
+        "data": {"target_temp_bkp": 55, "snapshot": snapshot},
+    }
+    mock_mug.data.name = ""
+    mock_mug.data.target_temp = 0
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "mug-1", "name")
+    await coordinator.async_load_storage()
+    assert coordinator.restored is True
+    assert coordinator.available is False
+    assert mock_mug.data.name == "Saved"
+    assert mock_mug.data.target_temp == 55
+
+    mock_mug.pair = AsyncMock()
+    mock_mug.make_writable = AsyncMock(return_value=True)
+    await coordinator._async_setup()
+    assert coordinator.restored is False
+    await hass.async_block_till_done()
+    mock_mug.update_initial.assert_called_once()
+
+
+@pytest.mark.parametrize(("firmware_version", "reads_initial"), [(411, False), (412, True)])
+async def test_static_info_cache(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+    firmware_version: int,
+    reads_initial: bool,
+) -> None:
+    """Test the static info is only read again if the firmware changed."""
+    mock_mug.data.firmware = MugFirmwareInfo(version=411, hardware=2, bootloader=1)
+    mock_mug.data.dsk = "dsk"
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "mug-1", "name")
+    coordinator.persistent_data = {"static_info": dump_static_info(mock_mug.data)}
+    mock_mug.data.dsk = ""
+    mock_mug.get_firmware.side_effect = [MugFirmwareInfo(version=firmware_version, hardware=2, bootloader=1)]
+
+    await coordinator._async_update_initial()
+    mock_mug.get_firmware.assert_called_once()
+    assert mock_mug.update_initial.called is reads_initial
+    if not reads_initial:
+        assert mock_mug.data.dsk == "dsk"
+        mock_mug.get_date_time_zone.assert_not_called()
+
+    # Restored or not, the first poll doesn't read them again
+    await coordinator._async_update_data()
+    mock_mug.get_firmware.assert_called_once()
+    for attr in ("meta", "dsk", "udsk"):
+        getattr(mock_mug, f"get_{attr}").assert_not_called()
+
+
+async def test_staged_startup(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test the critical attributes are read first and a failing stage doesn't stop the others."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "mug-1", "name")
+    mock_mug.pair = AsyncMock()
+    mock_mug.make_writable = AsyncMock(return_value=True)
+    mock_mug.update_initial.side_effect = BleakError()
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    await coordinator._async_setup()
+    mock_mug.get_current_temp.assert_called_once()
+    mock_mug.get_liquid_state.assert_called_once()
+    mock_mug.get_battery.assert_called_once()
+    mock_mug.get_target_temp.assert_not_called()
+    listener.assert_called_once()
+    assert list(coordinator.startup_stages) == ["critical"]
+    # Polls wait for the startup to finish
+    assert await coordinator._async_update_data() is mock_mug.data
+    mock_mug.update_queued_attributes.assert_not_called()
+
+    await hass.async_block_till_done()
+    mock_mug.get_target_temp.assert_called_once()
+    mock_mug.make_writable.assert_called_once()
+    assert {stage: info["result"] for stage, info in coordinator.startup_stages.items()} == {
+        "critical": "done",
+        "initial": "error",
+        "state": "done",
+        "writable": "done",
+    }
+    # Static attributes that failed are read by the next poll
+    assert "firmware" in coordinator._planner.plan(mock_mug.data.model_info.device_attributes)
+
+
+async def test_metrics(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test Bluetooth operations with the device are counted and timed."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    attrs = mock_mug.data.model_info.device_attributes
+    mock_mug._client = Mock(is_connected=False)
+
+    def connect() -> None:
+        mock_mug._client.is_connected = True
+
+    mock_mug._ensure_connection.side_effect = connect
+    # Too long ago to rely on notifications, but it was still received
+    mock_mug._latest_events[PushEvent.DRINK_TEMPERATURE_CHANGED] = time() - PUSH_HEALTHY_WINDOW.total_seconds()
+    # Only the temperature and liquid state are due after 20 seconds
+    coordinator._planner.mark_read(attrs, monotonic() - 20)
+
+    await coordinator._async_update_data()
+    metrics = coordinator.metrics
+    assert metrics.polls == 1
+    assert metrics.reads == 2
+    assert metrics.poll_latency is not None
+    assert metrics.last_success is not None
+    assert metrics.notifications == 1
+    # The first connection isn't a reconnect
+    assert metrics.reconnects == 0
+    assert [(operation.name, operation.characteristic, operation.outcome) for operation in metrics.trace] == [
+        ("slot_wait", "poll", "ok"),
+        ("connect", None, "ok"),
+        ("read", "current_temp", "ok"),
+        ("read", "liquid_state", "ok"),
+        ("poll", None, "ok"),
+    ]
+
+    mock_mug._client.is_connected = False
+    coordinator._planner.mark_read(attrs, monotonic() - 20)
+    await coordinator._async_update_data()
+    assert metrics.reconnects == 1
+    assert metrics.notifications == 1
+
+    mock_mug._ensure_connection.side_effect = TimeoutError()
+    coordinator._planner.mark_read(attrs, monotonic() - 20)
+    await coordinator._async_update_data()
+    mock_mug._ensure_connection.side_effect = BleakError()
+    await coordinator._async_update_data()
+    assert metrics.polls == 2
+    assert metrics.trace[-1].outcome == "bleak_error"
+    assert metrics.latency["poll"].count == 4
+    assert metrics.timeouts == 1
+    assert metrics.errors == 1
+
+    await coordinator._async_send_writes([(AsyncMock(), 1), (AsyncMock(), 2)])
+    assert metrics.writes == 2
+
+
+async def test_demanded_attributes(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test only attributes an enabled entity depends on are read, following entities being added and removed."""
+    coordinator = MugDataUpdateCoordinator(hass, Mock(), mock_mug, "id", "name")
+    device_attributes = mock_mug.data.model_info.device_attributes
+    assert coordinator.demanded_attributes == device_attributes
+
+    remove_listener = coordinator.async_add_attribute_listener({"current_temp", "led_colour"}, Mock())
+    assert coordinator.demanded_attributes == {"current_temp", "led_colour", "liquid_state", "battery"}
+    coordinator._planner.mark_read(device_attributes, monotonic() - 3600)
+    await coordinator._async_update_data()
+    mock_mug.get_led_colour.assert_called_once()
+    mock_mug.get_battery.assert_called_once()
+    mock_mug.get_target_temp.assert_not_called()
+    mock_mug.get_firmware.assert_not_called()
+
+    # Listeners for something that isn't a device attribute don't add anything
+    remove_metrics_listener = coordinator.async_add_attribute_listener({"metrics"}, Mock())
+    assert "metrics" not in coordinator.demanded_attributes
+
+    remove_listener()
+    remove_metrics_listener()
+    await coordinator._async_update_data()
+    mock_mug.get_target_temp.assert_called_once()
+
+    # Once the model is known, its attributes are read too
+    mock_mug.data.model_info = ModelInfo(DeviceModel.TRAVEL_MUG_12_OZ)
+    assert {"volume_level", "battery_voltage"} <= coordinator.demanded_attributes
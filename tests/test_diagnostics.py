@@ -74,6 +74,12 @@ async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
         "device-name",
     )
     hass.data[DOMAIN] = {"debug": True}
+    # Without any entities, everything is read
+    demanded_attributes = config_entry.runtime_data.demanded_attributes
+    assert demanded_attributes == mock_mug.data.model_info.device_attributes
+    # The firmware was just read, so only the temperature is read
+    config_entry.runtime_data.planner.mark_read(["firmware"])
+    config_entry.runtime_data.planner.plan(["current_temp", "firmware"])
 
     # Dump diagnostics
     dump = await async_get_config_entry_diagnostics(hass, config_entry)
@@ -117,8 +123,29 @@ async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
         "services": expected_services,
         "state": "Perfect",
         "address": TEST_MAC,
+        "startup_stages": {},
+        "demanded_attributes": sorted(demanded_attributes),
+        "reads": {"planned": 1, "skipped": 1},
+        "dispatches": {"dispatched": 0, "saved": 0},
+        "advertisements": {"processed": 0, "skipped": 0, "coalesced": 0},
+        "metrics": {
+            "polls": 0,
+            "poll_latency": None,
+            "last_success": None,
+            "reads": 0,
+            "writes": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "reconnects": 0,
+            "notifications": 0,
+        },
+        "latency": {},
+        "operations": [],
     }
 
+    # Dumping the data doesn't change what is read
+    assert config_entry.runtime_data.demanded_attributes == demanded_attributes
+
     # Error
     mock_mug.discover_services.side_effect = BleakError()
     mock_mug.discover_services.reset_mock()
@@ -4,15 +4,23 @@ from typing import TYPE_CHECKING, Any
 from unittest.mock import Mock, patch
 
 import pytest
+from ember_mug.consts import DeviceColour, DeviceModel
+from homeassistant.components.bluetooth import (
+    SOURCE_LOCAL,
+    BluetoothServiceInfoBleak,
+    async_get_advertisement_callback,
+)
 from homeassistant.config_entries import ConfigEntryState
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ember_mug import DOMAIN
-from custom_components.ember_mug.const import CONF_DEBUG, CONFIG_VERSION
+from custom_components.ember_mug.const import CONF_COLOUR, CONF_DEBUG, CONF_MODEL, CONFIG_VERSION
+from custom_components.ember_mug.scheduler import get_scheduler
 from tests import (
     CONFIG_DATA_V1,
     CONFIG_DATA_V2,
     DEFAULT_CONFIG_DATA,
+    MUG_SERVICE_INFO,
     TEST_BLE_DEVICE,
     TEST_MAC_UNIQUE_ID,
     TEST_MUG_NAME,
@@ -49,7 +57,8 @@ async def test_init(
     await hass.config_entries.async_unload(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
-    assert not hass.data.get(DOMAIN)
+    # The scheduler is kept, but the device no longer holds a connection slot
+    assert all(not adapter["connected"] for adapter in get_scheduler(hass).as_dict().values())
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
 
 
@@ -86,5 +95,49 @@ async def test_init_migration_v1(  # noqa: PLR0917
 
     assert mock_config_entry.state is ConfigEntryState.LOADED
     assert mock_config_entry.version == CONFIG_VERSION
-    assert mock_config_entry.data == DEFAULT_CONFIG_DATA
+    # The model info from the advertisement is saved as well
+    assert mock_config_entry.data == {
+        **DEFAULT_CONFIG_DATA,
+        CONF_MODEL: DeviceModel.MUG_2_10_OZ,
+        CONF_COLOUR: DeviceColour.BLACK,
+    }
     assert mock_config_entry.options == expected_options
+
+
+@patch("custom_components.ember_mug.EmberMug.pair", return_value=None)
+@patch("custom_components.ember_mug.EmberMug._update_multiple", return_value=[])
+async def test_init_saves_model_info(
+    mock_update_multiple: Mock,
+    mock_pair: Mock,
+    hass: HomeAssistant,
+) -> None:
+    """Test the model info is saved and reused without waiting for manufacturer data."""
+    mock_config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=TEST_MUG_NAME,
+        data=DEFAULT_CONFIG_DATA,
+        options=None,
+        unique_id=TEST_MAC_UNIQUE_ID,
+        version=CONFIG_VERSION,
+    )
+    mock_config_entry.add_to_hass(hass)
+    inject_ble_device_discovery_info(hass, TEST_BLE_DEVICE)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert mock_config_entry.data == {
+        **DEFAULT_CONFIG_DATA,
+        CONF_MODEL: DeviceModel.MUG_2_10_OZ,
+        CONF_COLOUR: DeviceColour.BLACK,
+    }
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The latest advertisement has no manufacturer data
+    service_info = {**MUG_SERVICE_INFO.as_dict(), "source": SOURCE_LOCAL, "manufacturer_data": {}, "time": 1}
+    async_get_advertisement_callback(hass)(BluetoothServiceInfoBleak(**service_info))
+    with patch("custom_components.ember_mug.bluetooth.async_process_advertisements") as mock_process:
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    mock_process.assert_not_called()
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    assert mock_config_entry.runtime_data.mug.data.model_info.model == DeviceModel.MUG_2_10_OZ
@@ -49,10 +49,10 @@ async def test_setup_light_mug(
         "color_mode": ColorMode.RGB,
         "supported_color_modes": [ColorMode.RGB],
         "supported_features": 0,
-        "brightness": None,
-        "hs_color": None,
-        "rgb_color": None,
-        "xy_color": None,
+        "brightness": 255,
+        "hs_color": (0.0, 0.0),
+        "rgb_color": (255, 255, 255),
+        "xy_color": (0.323, 0.329),
     }
     assert led_state.state == "on"
 
@@ -0,0 +1,102 @@
+"""Test the live data sent to websocket subscribers."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ember_mug.const import LIVE_FIELDS
+from custom_components.ember_mug.live import LiveData
+from tests.conftest import setup_platform
+
+if TYPE_CHECKING:
+    from ember_mug import EmberMug
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+
+async def test_live_data(hass: HomeAssistant) -> None:
+    """Test subscribers get the current values, then only the latest changes at most once per interval."""
+    values = dict.fromkeys(LIVE_FIELDS, 1)
+    live = LiveData(hass, values.get)
+    send = Mock()
+    unsubscribe = live.async_subscribe(send, ("current_temp", "liquid_level"), 1)
+    assert [(field, value) for field, value, _ in send.call_args.args[0]] == [
+        ("current_temp", 1),
+        ("liquid_level", 1),
+    ]
+
+    # Changes within the interval are merged into one message with the latest values
+    values["current_temp"] = 2
+    live.async_publish()
+    values["current_temp"] = 3
+    values["target_temp"] = 3
+    live.async_publish()
+    assert send.call_count == 1
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert send.call_count == 2
+    assert [(field, value) for field, value, _ in send.call_args.args[0]] == [("current_temp", 3)]
+
+    # Nothing is sent without changes or after unsubscribing
+    live.async_publish()
+    unsubscribe()
+    values["current_temp"] = 4
+    live.async_publish()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert send.call_count == 2
+    assert live.subscribers == 0
+
+
+async def test_websocket_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test the changes are sent to websocket subscribers, with a limit of subscriptions per connection."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    entry = await setup_platform(hass, mock_mug, "sensor")
+    coordinator = entry.runtime_data
+    device = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)[0]
+    mock_mug.data.current_temp = 55.5
+
+    client = await hass_ws_client(hass)
+    with patch("custom_components.ember_mug.websocket.LIVE_MAX_SUBSCRIPTIONS", 1):
+        await client.send_json_auto_id(
+            {
+                "type": "ember_mug/subscribe",
+                ATTR_DEVICE_ID: device.id,
+                "fields": ["current_temp", "available"],
+                "interval": 0.1,
+                "stream": True,
+            },
+        )
+        result = await client.receive_json()
+        assert result["success"]
+        event = await client.receive_json()
+        assert [delta[:2] for delta in event["event"]["deltas"]] == [["available", True], ["current_temp", 55.5]]
+        assert coordinator.streams.active
+
+        await client.send_json_auto_id({"type": "ember_mug/subscribe", ATTR_DEVICE_ID: device.id})
+        assert (await client.receive_json())["error"]["code"] == "not_allowed"
+
+    mock_mug.data.current_temp = 56.0
+    coordinator.refresh_from_mug()
+    event = await client.receive_json()
+    assert [delta[:2] for delta in event["event"]["deltas"]] == [["current_temp", 56.0]]
+
+    await client.send_json_auto_id({"type": "unsubscribe_events", "subscription": result["id"]})
+    assert (await client.receive_json())["success"]
+    assert coordinator.live.subscribers == 0
+    assert not coordinator.streams.active
+
+    await client.send_json_auto_id({"type": "ember_mug/subscribe", ATTR_DEVICE_ID: "unknown"})
+    assert (await client.receive_json())["error"]["code"] == "not_found"
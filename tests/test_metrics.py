@@ -0,0 +1,47 @@
+"""Test the Bluetooth operation metrics."""
+
+from __future__ import annotations
+
+from bleak import BleakError
+
+from custom_components.ember_mug.const import OPERATION_TRACE_SIZE
+from custom_components.ember_mug.metrics import LatencyHistogram, MugMetrics
+
+
+def test_latency_histogram() -> None:
+    """Test durations are counted in the right buckets."""
+    histogram = LatencyHistogram((10, 100))
+    for duration in (5, 10, 50, 500):
+        histogram.add(duration)
+    assert histogram.as_dict() == {
+        "count": 4,
+        "mean": 141.2,
+        "max": 500,
+        "buckets": {"<=10": 2, "<=100": 1, ">100": 1},
+    }
+    assert LatencyHistogram((10,)).as_dict()["mean"] is None
+
+
+def test_operation_trace() -> None:
+    """Test the trace only keeps the latest operations and each type has its own histogram."""
+    metrics = MugMetrics()
+    metrics.record_operation("connect", None, 1.5, TimeoutError(), "hci0")
+    for _ in range(OPERATION_TRACE_SIZE):
+        metrics.record_operation("read", "current_temp", 0.02, None, "proxy")
+    metrics.record_operation("write", "led_colour", 0.2, BleakError(), "proxy")
+
+    trace = metrics.trace_as_list()
+    assert len(trace) == OPERATION_TRACE_SIZE
+    assert trace[0]["name"] == "read"
+    assert {key: value for key, value in trace[-1].items() if key != "started"} == {
+        "name": "write",
+        "characteristic": "led_colour",
+        "duration": 200,
+        "outcome": "bleak_error",
+        "adapter": "proxy",
+    }
+    latency = metrics.latency_as_dict()
+    assert list(latency) == ["connect", "read", "write"]
+    assert latency["connect"]["buckets"][">10000"] == 0
+    assert latency["connect"]["max"] == 1500
+    assert latency["read"]["count"] == OPERATION_TRACE_SIZE
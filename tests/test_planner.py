@@ -0,0 +1,53 @@
+"""Test the read planner."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from custom_components.ember_mug.planner import ReadPlanner
+
+ATTRS = {"current_temp", "liquid_state", "liquid_level", "battery", "firmware", "dsk"}
+
+
+def test_plan_never_read() -> None:
+    """Test everything is read, in order of priority, if it was never read."""
+    planner = ReadPlanner()
+    assert planner.plan(ATTRS, now=0) == ["current_temp", "liquid_state", "liquid_level", "battery", "firmware", "dsk"]
+    assert planner.reads_planned == 6
+    assert planner.reads_skipped == 0
+
+
+def test_plan_max_age() -> None:
+    """Test only attributes past their maximum age are planned."""
+    planner = ReadPlanner()
+    planner.mark_read(ATTRS, now=0)
+    assert planner.plan(ATTRS, now=2) == []
+    assert planner.plan(ATTRS, now=30) == ["current_temp", "liquid_state", "liquid_level"]
+    assert planner.plan(ATTRS, now=3600) == ATTRS_BY_PRIORITY
+    assert planner.reads_skipped == 6 + 3
+    assert planner.age("dsk", now=60) == 60
+    assert planner.age("udsk") is None
+
+
+def test_plan_relaxed() -> None:
+    """Test relaxed attributes use the longer maximum age."""
+    planner = ReadPlanner()
+    planner.mark_read(ATTRS, now=0)
+    plan = planner.plan(
+        ATTRS,
+        relaxed={"current_temp", "liquid_level"},
+        relaxed_max_age=timedelta(minutes=10),
+        now=120,
+    )
+    assert plan == ["liquid_state", "battery"]
+
+
+ATTRS_BY_PRIORITY = ["current_temp", "liquid_state", "liquid_level", "battery", "firmware", "dsk"]
+
+
+def test_plan_always() -> None:
+    """Test attributes in `always` are planned even if they were just read."""
+    planner = ReadPlanner()
+    planner.mark_read(ATTRS, now=0)
+    assert planner.plan(ATTRS, always={"current_temp", "liquid_level"}, now=1) == ["current_temp", "liquid_level"]
+    assert planner.plan(ATTRS, always={"current_temp"}, exclude={"current_temp"}, now=1) == []
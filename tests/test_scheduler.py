@@ -0,0 +1,90 @@
+"""Test the connection slot scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.ember_mug.scheduler import ConnectionScheduler, SlotPriority, SlotTimeoutError
+
+
+async def test_slot_priority_and_order() -> None:
+    """Test writes go before polls and otherwise slots are given in the order they were requested."""
+    scheduler = ConnectionScheduler(slots=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("hci0", "mug-1", SlotPriority.POLL, AsyncMock(), 5):
+            await release.wait()
+
+    async def run(device: str, priority: SlotPriority) -> None:
+        async with scheduler.slot("hci0", device, priority, AsyncMock(), 5):
+            order.append(device)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(run("mug-2", SlotPriority.POLL)),
+        asyncio.create_task(run("mug-3", SlotPriority.POLL)),
+        asyncio.create_task(run("mug-4", SlotPriority.WRITE)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.as_dict()["hci0"]["waiting"] == 3
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    assert order == ["mug-4", "mug-2", "mug-3"]
+
+
+async def test_slot_evicts_idle_connection() -> None:
+    """Test the least recently used idle connection is closed to make room."""
+    scheduler = ConnectionScheduler(slots=2)
+    disconnects = {device: AsyncMock() for device in ("mug-1", "mug-2", "mug-3")}
+    for device in ("mug-1", "mug-2", "mug-3"):
+        async with scheduler.slot("proxy", device, SlotPriority.POLL, disconnects[device], 5):
+            pass
+
+    disconnects["mug-1"].assert_awaited_once()
+    disconnects["mug-2"].assert_not_awaited()
+    assert scheduler.as_dict()["proxy"]["connected"] == ["mug-2", "mug-3"]
+
+    # Adapters are independent
+    async with scheduler.slot("hci0", "mug-1", SlotPriority.POLL, disconnects["mug-1"], 5):
+        pass
+    disconnects["mug-2"].assert_not_awaited()
+
+    await scheduler.async_release("proxy", "mug-2")
+    assert scheduler.as_dict()["proxy"]["connected"] == ["mug-3"]
+
+
+async def test_slot_timeout() -> None:
+    """Test giving up if no slot becomes available."""
+    scheduler = ConnectionScheduler(slots=1)
+    async with scheduler.slot(None, "mug-1", SlotPriority.POLL, AsyncMock(), 5):
+        with pytest.raises(SlotTimeoutError):
+            async with scheduler.slot(None, "mug-2", SlotPriority.WRITE, AsyncMock(), 0.01):
+                pass
+    assert scheduler.as_dict()["default"]["waiting"] == 0
+
+
+async def test_slot_wait_cancelled() -> None:
+    """Test a cancelled wait gives up its place, so it doesn't hold up devices waiting after it."""
+    scheduler = ConnectionScheduler(slots=1)
+
+    async def wait() -> None:
+        async with scheduler.slot(None, "mug-2", SlotPriority.POLL, AsyncMock(), 5):
+            pass
+
+    async with scheduler.slot(None, "mug-1", SlotPriority.POLL, AsyncMock(), 5):
+        waiter = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+    assert scheduler.as_dict()["default"]["waiting"] == 0
+
+    async with scheduler.slot(None, "mug-3", SlotPriority.POLL, AsyncMock(), 0.01):
+        pass
+    assert scheduler.as_dict()["default"]["connected"] == ["mug-3"]
@@ -5,14 +5,24 @@ from __future__ import annotations
 from functools import partial
 from typing import TYPE_CHECKING
 
+import pytest
 from ember_mug.consts import DeviceModel, LiquidState, TemperatureUnit
 from ember_mug.data import ModelInfo
 from homeassistant.components.sensor import SensorStateClass
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
 from homeassistant.helpers import entity_registry as er
-
-from custom_components.ember_mug.const import DOMAIN, ICON_DEFAULT, LIQUID_STATE_OPTIONS
-
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.ember_mug.const import (
+    CONF_TEMP_DEADBAND,
+    CONFIG_VERSION,
+    DOMAIN,
+    ICON_DEFAULT,
+    LIQUID_STATE_OPTIONS,
+)
+from custom_components.ember_mug.sensor import METRIC_SENSOR_TYPES
+
+from . import DEFAULT_CONFIG_DATA, TEST_MAC_UNIQUE_ID, TEST_MUG_NAME
 from .conftest import setup_platform
 
 if TYPE_CHECKING:
@@ -107,3 +117,87 @@ async def test_setup_sensors(
     battery_percent_sensor = entity_registry.async_get(battery_entity_id)
     assert battery_percent_sensor.translation_key == "battery_percent"
     assert battery_percent_sensor.original_name == "Battery"
+
+
+async def test_metric_sensors_disabled(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test the Bluetooth metric sensors are diagnostic and disabled by default."""
+    mock_mug.data.model_info = ModelInfo(DeviceModel.MUG_2_10_OZ)
+    config = await setup_platform(hass, mock_mug, "sensor")
+    entity_registry = er.async_get(hass)
+
+    for metric in METRIC_SENSOR_TYPES:
+        entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, f"ember_mug_{config.unique_id}_{metric}")
+        assert entity_id is not None
+        entry = entity_registry.async_get(entity_id)
+        assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+        assert entry.entity_category is EntityCategory.DIAGNOSTIC
+        assert entry.translation_key == metric
+        assert hass.states.get(entity_id) is None
+
+
+async def test_temperature_deadband(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test small changes of the temperature are not written, unless past the deadband set in the options."""
+    mock_mug.data.model_info = ModelInfo(DeviceModel.MUG_2_10_OZ)
+    mock_mug.data.current_temp = 55.1
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=TEST_MUG_NAME,
+        data=DEFAULT_CONFIG_DATA,
+        options={CONF_TEMP_DEADBAND: 0.5},
+        version=CONFIG_VERSION,
+        unique_id=TEST_MAC_UNIQUE_ID,
+    )
+    config = await setup_platform(hass, mock_mug, "sensor", config_entry)
+    coordinator = config.runtime_data
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, f"ember_mug_{config.unique_id}_current_temp")
+    assert hass.states.get(entity_id).state == "55.1"
+
+    mock_mug.data.current_temp = 55.43
+    coordinator.async_update_attribute_listeners(["current_temp"])
+    assert hass.states.get(entity_id).state == "55.1"
+
+    mock_mug.data.current_temp = 55.62
+    coordinator.async_update_attribute_listeners(["current_temp"])
+    state = hass.states.get(entity_id)
+    assert state.state == "55.6"
+    assert state.attributes["native_value"] == 55.62
+
+
+async def test_sensor_model_attrs(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+) -> None:
+    """Test the parts of the state depending on the model are worked out again if the model is only found later."""
+    mock_mug.data.liquid_level = 15
+    config = await setup_platform(hass, mock_mug, "sensor")
+    coordinator = config.runtime_data
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, f"ember_mug_{config.unique_id}_liquid_level")
+    assert hass.states.get(entity_id).state == "50"
+
+    mock_mug.data.model_info = ModelInfo(DeviceModel.TRAVEL_MUG_12_OZ)
+    mock_mug.data.liquid_level = 60
+    coordinator.async_update_listeners()
+    state = hass.states.get(entity_id)
+    assert state.state == "60"
+    assert state.attributes["capacity"] == 355
+
+
+@pytest.mark.parametrize("debug", [False, True])
+async def test_state_sensor_debug_attrs(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+    debug: bool,
+) -> None:
+    """Test the attributes only shown in debug mode are only read in debug mode."""
+    mock_mug.data.debug = debug
+    config = await setup_platform(hass, mock_mug, "sensor")
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, f"ember_mug_{config.unique_id}_state")
+    debug_attrs = {"date_time_zone", "udsk", "dsk"}
+    assert (debug_attrs <= config.runtime_data.demanded_attributes) is debug
+    assert (debug_attrs <= hass.states.get(entity_id).attributes.keys()) is debug
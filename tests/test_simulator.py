@@ -0,0 +1,113 @@
+"""Test the simulated device used for benchmarks."""
+
+from __future__ import annotations
+
+from time import monotonic
+
+import pytest
+from bleak import BleakError
+from ember_mug.consts import DeviceModel, LiquidState, PushEvent
+from ember_mug.data import ModelInfo
+
+from . import TEST_BLE_DEVICE
+from .simulator import FaultInjection, SimulatedEmberMug, ThermalState
+
+
+async def test_simulated_reads() -> None:
+    """Test the real client can read everything from the simulated device."""
+    mug = SimulatedEmberMug(TEST_BLE_DEVICE, ModelInfo(DeviceModel.MUG_2_10_OZ), use_metric=True)
+    await mug.update_initial()
+    await mug.update_all()
+    assert mug.data.meta.serial_number == "SIM-000001"
+    assert mug.data.firmware.version == 348
+    assert mug.data.current_temp == 22
+    assert mug.data.target_temp == 55
+    assert mug.data.liquid_level == 30
+    assert mug.data.battery.percent == 80
+    assert mug.data.battery.on_charging_base is True
+    assert mug.data.name == "Ember Mug"
+    assert mug.can_write is False
+
+    assert await mug.make_writable() is True
+    await mug.set_target_temp(60)
+    assert mug.thermal.target_temp == 60
+    assert mug.connects == 1
+
+
+async def test_thermal_model() -> None:
+    """Test the device heats up, holds the target temperature and cools down without temperature control."""
+    mug = SimulatedEmberMug(TEST_BLE_DEVICE, thermal=ThermalState(current_temp=40, target_temp=55))
+    mug.advance(60)
+    assert mug.thermal.liquid_state == LiquidState.HEATING
+    assert mug.thermal.current_temp == pytest.approx(43)
+    mug.advance(600)
+    assert mug.thermal.liquid_state == LiquidState.TARGET_TEMPERATURE
+    assert mug.thermal.current_temp == 55
+
+    mug.thermal.target_temp = 0
+    mug.set_charging(False)
+    mug.advance(600)
+    assert mug.thermal.liquid_state == LiquidState.WARM_NO_TEMP_CONTROL
+    assert mug.thermal.current_temp < 55
+    assert mug.thermal.battery < 100
+
+    mug.thermal.liquid_level = 0
+    mug.advance(1)
+    assert mug.thermal.liquid_state == LiquidState.EMPTY
+
+
+async def test_notifications() -> None:
+    """Test notifications are only sent while connected and queue the attributes that changed."""
+    mug = SimulatedEmberMug(TEST_BLE_DEVICE, thermal=ThermalState(current_temp=40), sip_rate=3)
+    mug.advance(60)
+    assert mug.notifications_sent == 0
+
+    await mug._ensure_connection()
+    mug.advance(60)
+    assert mug.notifications_sent > 0
+    assert {"current_temp", "liquid_level"} <= mug._queued_updates
+    assert PushEvent.DRINK_TEMPERATURE_CHANGED in mug._latest_events
+    assert mug.thermal.liquid_level < 30
+
+
+async def test_fault_injection_is_reproducible() -> None:
+    """Test failures are injected at the given rate and the same seed fails the same way."""
+
+    async def run(seed: int) -> list[bool]:
+        mug = SimulatedEmberMug(TEST_BLE_DEVICE, seed=seed, faults=FaultInjection(read_failure_rate=0.5))
+        results = []
+        for _ in range(20):
+            try:
+                await mug.get_current_temp()
+            except BleakError:
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+
+    results = await run(1)
+    assert results == await run(1)
+    assert True in results
+    assert False in results
+
+    mug = SimulatedEmberMug(TEST_BLE_DEVICE, faults=FaultInjection(timeout_rate=1))
+    with pytest.raises(TimeoutError):
+        await mug.get_battery()
+
+
+async def test_latency_and_clock() -> None:
+    """Test operations take the injected latency and the model follows the clock."""
+    now = [0.0]
+    mug = SimulatedEmberMug(
+        TEST_BLE_DEVICE,
+        thermal=ThermalState(current_temp=40, target_temp=55),
+        faults=FaultInjection(latency=0.01),
+        clock=lambda: now[0],
+    )
+    start = monotonic()
+    assert await mug.get_current_temp() == 40
+    assert monotonic() - start >= 0.01
+
+    now[0] = 20
+    assert await mug.get_current_temp() == pytest.approx(41)
+    assert mug.elapsed == 20
@@ -0,0 +1,64 @@
+"""Test saving and restoring the last known state of a device."""
+
+from __future__ import annotations
+
+import json
+
+from ember_mug.consts import DeviceColour, DeviceModel, TemperatureUnit, VolumeLevel
+from ember_mug.data import Colour, ModelInfo, MugData, MugFirmwareInfo, MugMeta
+
+from custom_components.ember_mug.snapshot import (
+    dump_snapshot,
+    dump_static_info,
+    restore_snapshot,
+    restore_static_info,
+)
+
+
+def test_snapshot_round_trip() -> None:
+    """Test a snapshot survives being stored as JSON and restores the same values."""
+    data = MugData(ModelInfo(DeviceModel.TRAVEL_MUG_12_OZ, DeviceColour.BLACK))
+    data.firmware = MugFirmwareInfo(version=411, hardware=2, bootloader=1)
+    data.meta = MugMeta(mug_id="abcdef", serial_number="ABC1234")
+    data.led_colour = Colour(10, 20, 30, 200)
+    data.name = "Coffee"
+    data.volume_level = VolumeLevel.HIGH
+    data.temperature_unit = TemperatureUnit.FAHRENHEIT
+    data.target_temp = 130.5
+
+    snapshot = json.loads(json.dumps(dump_snapshot(data)))
+    restored = MugData(ModelInfo())
+    assert restore_snapshot(restored, snapshot) is True
+    assert restored.model_info == data.model_info
+    for attr in ("firmware", "meta", "led_colour", "name", "volume_level", "temperature_unit", "target_temp"):
+        assert getattr(restored, attr) == getattr(data, attr)
+
+    # The model from the advertisement is kept
+    restored = MugData(ModelInfo(DeviceModel.MUG_2_10_OZ))
+    restore_snapshot(restored, snapshot)
+    assert restored.model_info.model == DeviceModel.MUG_2_10_OZ
+
+
+def test_restore_invalid_snapshot() -> None:
+    """Test a snapshot that can't be restored is ignored."""
+    assert restore_snapshot(MugData(ModelInfo()), {"model": "Unknown"}) is False
+
+
+def test_static_info() -> None:
+    """Test static info is only restored for the same firmware."""
+    data = MugData(ModelInfo())
+    assert dump_static_info(data) is None
+    data.firmware = MugFirmwareInfo(version=411, hardware=2, bootloader=1)
+    data.meta = MugMeta(mug_id="abcdef", serial_number="ABC1234")
+    data.dsk = "dsk"
+    data.udsk = "udsk"
+    static_info = json.loads(json.dumps(dump_static_info(data)))
+
+    restored = MugData(ModelInfo())
+    assert restore_static_info(restored, static_info) is False
+    restored.firmware = MugFirmwareInfo(version=412, hardware=2, bootloader=1)
+    assert restore_static_info(restored, static_info) is False
+    assert restored.meta is None
+    restored.firmware = MugFirmwareInfo(version=411, hardware=2, bootloader=1)
+    assert restore_static_info(restored, static_info) is True
+    assert (restored.meta, restored.dsk, restored.udsk) == (data.meta, "dsk", "udsk")
@@ -0,0 +1,37 @@
+"""Test the filter of small sensor value changes."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.ember_mug.state_filter import StateFilter
+
+
+def test_state_filter() -> None:
+    """Test only changes past the deadband are written, or any change once the state is old enough."""
+    state_filter = StateFilter(precision=1, deadband=0.2, max_age=60)
+    with patch("custom_components.ember_mug.state_filter.monotonic") as monotonic:
+        monotonic.return_value = 0
+        assert state_filter.update(55.04)
+        assert state_filter.value == 55.0
+        # Noise within the deadband, or rounded away
+        assert not state_filter.update(55.12)
+        assert not state_filter.update(55.01)
+        assert state_filter.update(55.2)
+        # The rest of the state changing is always written
+        assert state_filter.update(55.3, key=True)
+        assert state_filter.value == 55.3
+        assert state_filter.suppressed == 2
+
+        monotonic.return_value = 61
+        assert not state_filter.update(55.3, key=True)
+        assert state_filter.update(55.4, key=True)
+        assert state_filter.update(None, key=True)
+
+
+def test_state_filter_without_decimals() -> None:
+    """Test values are rounded to ints without decimals."""
+    state_filter = StateFilter(precision=0, deadband=1, max_age=60)
+    assert state_filter.update(33.3)
+    assert state_filter.value == 33
+    assert isinstance(state_filter.value, int)
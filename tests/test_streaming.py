@@ -0,0 +1,80 @@
+"""Test the high-rate streaming mode."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.ember_mug.const import (
+    ATTR_DURATION,
+    DOMAIN,
+    SERVICE_START_STREAMING,
+    SERVICE_STOP_STREAMING,
+    STREAM_INTERVAL,
+    UPDATE_INTERVAL_ACTIVE,
+)
+from custom_components.ember_mug.streaming import StreamLeases
+from tests.conftest import setup_platform
+
+if TYPE_CHECKING:
+    from ember_mug import EmberMug
+    from homeassistant.core import HomeAssistant
+
+
+async def test_stream_leases(hass: HomeAssistant) -> None:
+    """Test streaming lasts until the last lease expires or is released."""
+    on_change = Mock()
+    leases = StreamLeases(hass, on_change)
+    leases.async_acquire("service", timedelta(minutes=1))
+    release = leases.async_acquire("subscriber")
+    on_change.assert_called_once_with(True)
+
+    # Renewing replaces the expiry
+    leases.async_acquire("service", timedelta(minutes=5))
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=2))
+    await hass.async_block_till_done()
+    release()
+    assert leases.active
+    on_change.assert_called_once_with(True)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=6))
+    await hass.async_block_till_done()
+    assert not leases.active
+    on_change.assert_called_with(False)
+    assert leases.leases_granted == 3
+
+
+async def test_streaming_services(hass: HomeAssistant, mock_mug: EmberMug | Mock) -> None:
+    """Test the services switch the device to the stream interval and back."""
+    entry = await setup_platform(hass, mock_mug, "sensor")
+    coordinator = entry.runtime_data
+    device = dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)[0]
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_STREAMING,
+        {ATTR_DEVICE_ID: device.id, ATTR_DURATION: {"seconds": 30}},
+        blocking=True,
+    )
+    assert coordinator.streams.active
+    assert coordinator.update_interval == STREAM_INTERVAL
+    assert {"current_temp", "liquid_level"} <= coordinator.demanded_attributes
+    # Writing something keeps streaming
+    coordinator.refresh_from_mug()
+    assert coordinator.update_interval == STREAM_INTERVAL
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_STREAMING, {ATTR_DEVICE_ID: device.id}, blocking=True)
+    assert not coordinator.streams.active
+    # Still polling quickly after the write
+    assert coordinator.update_interval == UPDATE_INTERVAL_ACTIVE
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_START_STREAMING, {ATTR_DEVICE_ID: "unknown"}, blocking=True)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
+import pytest
 from ember_mug.consts import DeviceModel
 from ember_mug.data import ModelInfo
-from homeassistant.const import Platform
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON, Platform
 from homeassistant.helpers import entity_registry as er
 
 from custom_components.ember_mug import DOMAIN
@@ -50,3 +53,40 @@ async def test_setup_switch_mug(
     switch_entity = entity_registry.async_get(entity_id)
     assert switch_entity.translation_key == "temperature_control"
     assert switch_entity.original_name == "Temperature Control"
+
+
+@pytest.mark.parametrize(
+    ("target_temp", "services", "expected_backup"),
+    [
+        (65, (SERVICE_TURN_OFF, SERVICE_TURN_ON), 65),
+        # The stored temp it was turned on at is backed up again
+        (0, (SERVICE_TURN_ON, SERVICE_TURN_OFF), 60),
+    ],
+)
+async def test_switch_quick_toggle(
+    hass: HomeAssistant,
+    mock_mug: EmberMug | Mock,
+    target_temp: float,
+    services: tuple[str, str],
+    expected_backup: float,
+) -> None:
+    """Test toggling again before the first change was written ends up in the last state."""
+    mock_mug.data.target_temp = target_temp
+    mock_mug.data.model_info = ModelInfo(DeviceModel.MUG_2_10_OZ)
+    config = await setup_platform(hass, mock_mug, Platform.SWITCH)
+    config.runtime_data.persistent_data["target_temp_bkp"] = 60
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "switch",
+        DOMAIN,
+        f"ember_mug_{config.unique_id}_temperature_control",
+    )
+
+    with patch.object(mock_mug, "set_target_temp") as mock_set:
+        await asyncio.gather(
+            *(
+                hass.services.async_call("switch", service, {ATTR_ENTITY_ID: entity_id}, blocking=True)
+                for service in services
+            ),
+        )
+    mock_set.assert_called_once_with(target_temp)
+    assert config.runtime_data.persistent_data["target_temp_bkp"] == expected_backup